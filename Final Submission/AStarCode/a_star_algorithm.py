@@ -2,118 +2,187 @@
 import time
 from node import Node
 from board import Board
+from frontier import Frontier
+from heuristics import get_heuristic
+from search_stats import SearchResult, SearchStats
 
-def get_smallest_val(array):
+# The weight of the heuristic used by weighted A*
+WEIGHT = 2
+# The number of nodes a search run to completion expands per step
+STEP = 1000
+
+
+class AStarSearch:
     """
-    get_smallest_val is a function which takes an array of nodes and returns the node with the smallest f value
-    :param array: array containing nodes
-    :return: min_node - the smallest node in the array
+    Class to represent an A* search which can be advanced a few expansions at a time, so the caller can interleave it
+    with other work (such as the tkinter 'after' loop or an asyncio loop) or stop it early, without a thread
+    the search is created ready to run, each call to 'step' expands up to n nodes, and 'result' holds the SearchResult
+    once the search has finished. The open and closed lists can be inspected between steps, and 'stats' holds the
+    statistics so far (the wall time only counts the time spent in 'step')
     """
-    # Assume the first element to be the smallest node
-    min_node = array[0]
-    # Iterate through the elements of the array
-    for node in array:
-        # if an element has a smaller f value than the current min node, set the new minimum node to the current node
-        if node.f < min_node.f:
-            min_node = node
-    # the smallest node would be stored in min_node, return this node
-    return min_node
-
-def a_star(start_board, goal_board, algo):
+
+    def __init__(self, start_board, goal_board, algo, budget=None, stats=None, weight=1):
+        """
+        the init function creates the start and goal boards and the open list holding the starting node
+        :param start_board: A 2D Array containing values for the start board
+        :param goal_board: A 2D Array containing values for the goal board
+        :param algo: the name of the heuristic algorithm to use
+        :param budget: a Budget limiting the number of nodes expanded and the time taken, None for no limit
+        :param stats: a SearchStats to fill in (with any hooks or profiler to run), None to create a new one
+        :param weight: the weight of the heuristic, 1 for the optimal solution
+        """
+        self.budget = budget
+        self.stats = SearchStats() if stats is None else stats
+        # the SearchResult of the search, None until it has finished
+        self.result = None
+        self.stats.start()
+        try:
+            # Set the global 'algo' variable of board to the passed in algorithm string
+            Board.algo = algo
+            # Create the start and goal boards, and prepare the heuristic for the goal board once for the whole search
+            start = Board(start_board)
+            self.goal = Board(goal_board)
+            self.heuristic = self.stats.timed(get_heuristic(algo, self.goal))
+
+            # Instantiate the Open and Closed List, the open list is a heap of nodes ordered by f value (or
+            # g + weight * h), the closed list maps the board of each searched node to the cost (g) it was searched
+            # with
+            self.open_list = Frontier(weight)
+            self.closed_list = {}
+            self.stats.bound = weight
+            # set a counter to count the number of loops used (measurement of comparison which is not affected by
+            # hardware)
+            self.counter = 0
+
+            # if the goal cannot be reached from the start, the search would have to exhaust every reachable board
+            # before giving up, so check the parity of the boards first and finish with an empty list straight away
+            if not start.is_solvable(self.goal):
+                self.result = SearchResult([], self.stats)
+                return
+
+            # Create the starting node and push this onto the open_list
+            self.open_list.push(Node(start, None, None, 0, self.heuristic.evaluate(start)))
+        finally:
+            self.stats.stop()
+
+    @property
+    def done(self):
+        """
+        whether the search has finished
+        :return: a Boolean, True once 'result' holds the SearchResult
+        """
+        return self.result is not None
+
+    def step(self, n=1):
+        """
+        function to advance the search by up to n expansions
+        :param n: the largest number of nodes to expand
+        :return: the SearchResult if the search has finished, otherwise None
+        """
+        if self.result is not None:
+            return self.result
+        stats = self.stats
+        open_list = self.open_list
+        closed_list = self.closed_list
+        stats.start()
+        try:
+            # while there are elements in the open_list (and this step has expansions left) do the following
+            for i in range(0, n):
+                if len(open_list) == 0:
+                    # if the code reaches here, assume the problem is unsolvable, and finish with an empty list
+                    self.result = SearchResult([], stats)
+                    break
+                # increment counter
+                self.counter += 1
+                # stop the search if it has run out of its budget
+                if self.budget is not None:
+                    self.budget.charge(self.counter)
+
+                # remove the node in open_list with the smallest f value and store it in current
+                current = open_list.pop()
+                stats.expand(current, len(open_list), len(closed_list))
+
+                # check if this node is the goal
+                if current.is_goal(self.goal):
+                    # rebuild the path from the parent of each node, and prepend the current nodes cost (g) and
+                    # counter of loops to it (for reference in calling code)
+                    self.result = SearchResult([current.g, self.counter] + current.get_path(), stats)
+                    break
+
+                # find all successors of the current node
+                st = time.perf_counter()
+                successors = current.get_successors(self.heuristic)
+                stats.generate_time += time.perf_counter() - st
+                stats.generated += len(successors)
+
+                # for each successor node
+                for node in successors:
+
+                    # look for this node's board in closed list
+                    closed_g = closed_list.get(node.board)
+                    if closed_g is not None:
+                        # if the board was already searched with a cost no greater than the successor's, skip the
+                        # rest of the loop for this successor i.e. - discard the successor
+                        if closed_g <= node.g:
+                            stats.duplicates_closed += 1
+                            continue
+                        # otherwise a cheaper path to the board was found, reopen it by removing it from closed_list
+                        del closed_list[node.board]
+
+                    # push the successor onto open_list, if a node with the same board is already in open_list then
+                    # only the one with the smaller cost (g) is kept, the other is discarded
+                    if not open_list.push(node):
+                        stats.duplicates_open += 1
+
+                # add the board of the current node which was removed from open_list, to closed_list as it has now
+                # been searched, along with the cost it was searched with
+                closed_list[current.board] = current.g
+        finally:
+            stats.stop()
+        return self.result
+
+    def steps(self, n=STEP):
+        """
+        generator to run the search n expansions at a time, yielding None after each step until the search has
+        finished, then yielding the SearchResult
+        :param n: the number of nodes to expand between each yield
+        :return: yields None while the search runs, then the SearchResult
+        """
+        while self.step(n) is None:
+            yield None
+        yield self.result
+
+
+def a_star(start_board, goal_board, algo, budget=None, stats=None, weight=1):
     """
     a_star is a function which takes a start and goal board layout and uses the implemented A* algorithm to
-    find the shortest number of moves to reach this goal.
+    find the shortest number of moves to reach this goal. It runs an AStarSearch to completion
+    with a weight above 1 this is weighted A*, nodes are expanded in order of g + weight * h rather than f, which
+    expands far fewer nodes but only guarantees a solution at most 'weight' times the length of the shortest one
     :param start_board: A 2D Array containing values for the start board
     :param goal_board: A 2D Array containing values for the goal board
-    :return: An array is returned containing the individual moves required to get from the start to goal node
+    :param algo: the name of the heuristic algorithm to use
+    :param budget: a Budget limiting the number of nodes expanded and the time taken, None for no limit
+    :param stats: a SearchStats to fill in (with any hooks or profiler to run), None to create a new one
+    :param weight: the weight of the heuristic, 1 for the optimal solution
+    :return: A SearchResult is returned containing the cost, the number of while loops and the individual moves
+             required to get from the start to goal node (empty if the puzzle is unsolvable), and the statistics
     """
+    search = AStarSearch(start_board, goal_board, algo, budget, stats, weight)
+    while search.step(STEP) is None:
+        pass
+    return search.result
+
 
-    #Start Time
-    st = time.time()
-
-    # Set the global 'algo' variable of board to the passed in algorithm string
-    Board.algo = algo
-
-    # Instantiate the Open and Closed List
-    open_list = []
-    closed_list = []
-
-    # Create the starting node and append this to the open_list
-    open_list.append(Node(Board(start_board), Board(goal_board), 0, [], True))
-
-    # set a counter to count the number of loops used (measurement of comparison which is not affected by hardware)
-    counter = 0
-    # while there are elements in the open_list do the following
-    while len(open_list) > 0:
-        # increment counter
-        counter += 1
-        print(counter)
-
-        # get the node in open_list with the smallest f value and store it in current
-        current = get_smallest_val(open_list)
-        # remove 'current' from the array
-        open_list.remove(current)
-
-        # check if this node is the goal
-        if current.is_goal():
-            # store the path in an array 'res'
-            moves = []
-            for move in current.path:
-                moves.append(move[1])
-                # if the current node is the goal output a string with some basic information
-            print("reached goal after " + str(current.g) + " moves, using " + str(counter) + " while loops on open_list")
-            print(moves)
-
-            # prepend the current nodes cost (g) and counter of loops to the moves array (for reference in calling code)
-            res = [current.g, counter] + moves
-            # return this 'res' array with information regarding the solution
-
-            # End Time
-            print("--- %s seconds ---" % (time.time() - st))
-
-            return res
-
-        # find all successors of the current node
-        successors = current.get_successors()
-
-        # for each successor node
-        for node in successors:
-
-            # look for this node in closed list
-            # set found token to False
-            found = False
-            # look at each element in closed_list
-            for elem in closed_list:
-                # if the current element in the list has the same board as node, then set 'found' to true
-                if node == elem:
-                    found = True
-            # if the successor was found in closed list, skip the rest of the loop for this successor
-            # i.e. - discard the successor
-            if found:
-                continue
-
-            # look for this node in open_list,
-            # 'found' does not need to be set to false as reaching here implies it already is
-            for elem in open_list:
-                # if an element in open_list is found with the same board
-                if elem == node:
-                    # and this element has a greater cost (g) than the successor
-                    if elem.g > node.g:
-                        # then remove the element from open_list (the successor will later be added to open_list)
-                        open_list.remove(elem)
-                    else:
-                        # if this element has not got a greater cost than the successor
-                        # then, set found to true
-                        found = True
-            # if the successors board wasn't found in open_list (or is not in open_list anymore)
-            if not found:
-                # append the successor to open_list
-                open_list.append(node)
-
-        # append the current node which was removed from open_list, to closed_list as it has now been searched
-        closed_list.append(current)
-
-    # if the code reaches here, assume the problem is unsolvable, and return an empty list
-    # End Time
-    print("--- %s seconds ---" % (time.time() - st))
-    return []
+def weighted_a_star(start_board, goal_board, algo, budget=None, stats=None):
+    """
+    weighted_a_star is a function which runs A* with the heuristic weighted by WEIGHT, for a fast solution which is at
+    most WEIGHT times the length of the shortest one
+    :param start_board: A 2D Array containing values for the start board
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: the name of the heuristic algorithm to use
+    :param budget: a Budget limiting the number of nodes expanded and the time taken, None for no limit
+    :param stats: a SearchStats to fill in (with any hooks or profiler to run), None to create a new one
+    :return: the SearchResult of a_star
+    """
+    return a_star(start_board, goal_board, algo, budget, stats, WEIGHT)
@@ -0,0 +1,138 @@
+# Import the Node and Board Classes from their respective files
+import time
+from node import Node
+from board import Board
+from budget import SearchLimitExceeded
+from frontier import Frontier
+from heuristics import get_heuristic
+from search_stats import SearchResult, SearchStats
+
+# The weight of the heuristic in the first search, and the amount it is lowered by for each search after it
+START_WEIGHT = 3
+WEIGHT_STEP = 0.5
+
+
+def ara_star(start_board, goal_board, algo, budget=None, stats=None, weight=START_WEIGHT, step=WEIGHT_STEP):
+    """
+    ara_star is a function which uses the Anytime Repairing A* algorithm to find a first solution quickly and then
+    shorter ones while its budget allows, until the shortest number of moves to reach the goal is proved.
+    ARA* runs a weighted A* search and then repeats it with a smaller weight each time, reusing the nodes found by the
+    earlier searches. Each search only expands the nodes whose priority is below the cost of the best solution so far,
+    and a node whose cost improves after it was expanded is kept aside for the next search instead of being reopened.
+    After each search the suboptimality bound is the cost of the best solution over the smallest f value of the nodes
+    not yet expanded, and is reported in 'stats.bound'
+    :param start_board: A 2D Array containing values for the start board
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: the name of the heuristic algorithm to use
+    :param budget: a Budget limiting the number of nodes expanded and the time taken, None for no limit. When it runs
+                   out, the best solution so far is returned, the error is only raised if no solution has been found
+    :param stats: a SearchStats to fill in (with any hooks or profiler to run), None to create a new one
+    :param weight: the weight of the heuristic in the first search
+    :param step: the amount the weight is lowered by for each search, down to 1
+    :return: A SearchResult is returned containing the cost, the number of nodes expanded and the individual moves
+             required to get from the start to goal node (empty if the puzzle is unsolvable), and the statistics
+    """
+
+    if stats is None:
+        stats = SearchStats()
+    stats.start()
+    try:
+        # Set the global 'algo' variable of board to the passed in algorithm string
+        Board.algo = algo
+        # Create the start and goal boards, and prepare the heuristic for the goal board once for the whole search
+        start = Board(start_board)
+        goal = Board(goal_board)
+        heuristic = stats.timed(get_heuristic(algo, goal))
+
+        # the searches would have to exhaust every reachable board before giving up on an unsolvable puzzle, so check
+        # the parity of the boards first
+        if not start.is_solvable(goal):
+            return SearchResult([], stats)
+
+        # the open list is ordered by g + weight * h, best maps each board found to its cheapest node, closed holds
+        # the boards expanded by the current search and incons the nodes improved after they were expanded
+        open_list = Frontier(weight)
+        root = Node(start, None, None, 0, heuristic.evaluate(start))
+        open_list.push(root)
+        best = {start: root}
+        closed = set()
+        incons = {}
+        # the goal node of the best solution so far, there is no bound on its cost until a solution is found
+        solution = None
+        stats.bound = None
+        # set a counter to count the number of nodes expanded over every search
+        counter = 0
+
+        while True:
+            limited = False
+            try:
+                # expand nodes while the open list holds a node which could lead to a cheaper solution
+                while len(open_list) > 0:
+                    current = open_list.peek()
+                    if solution is not None and open_list.priority(current) >= solution.g:
+                        break
+                    open_list.pop()
+                    counter += 1
+                    # stop the search if it has run out of its budget
+                    if budget is not None:
+                        budget.charge(counter)
+                    stats.expand(current, len(open_list), len(closed))
+                    closed.add(current.board)
+
+                    if current.is_goal(goal):
+                        # only the start board can reach here as the goal, successors which reach it are kept aside
+                        solution = current
+                        continue
+
+                    # find all successors of the current node
+                    st = time.perf_counter()
+                    successors = current.get_successors(heuristic)
+                    stats.generate_time += time.perf_counter() - st
+                    stats.generated += len(successors)
+
+                    for node in successors:
+                        # discard the successor unless it is the cheapest way found to its board
+                        found = best.get(node.board)
+                        if found is not None and found.g <= node.g:
+                            stats.duplicates_closed += 1
+                            continue
+                        best[node.board] = node
+                        if node.is_goal(goal):
+                            # a cheaper solution, the goal itself never needs expanding
+                            solution = node
+                        elif node.board in closed:
+                            # the board was already expanded by this search, keep it for the next search
+                            incons[node.board] = node
+                        elif not open_list.push(node):
+                            stats.duplicates_open += 1
+            except SearchLimitExceeded:
+                # the budget ran out, return the best solution so far if there is one
+                if solution is None:
+                    raise
+                limited = True
+
+            if solution is None:
+                # every reachable board was expanded without reaching the goal
+                return SearchResult([], stats)
+
+            # the optimal cost is at least the smallest f value of the nodes not yet expanded
+            lower = min([node.f for node in incons.values()] +
+                        [entry[-1].f for entry in open_list.entries.values()] + [solution.g])
+            bound = solution.g / lower if lower > 0 else 1
+            # a search which finished also guarantees a solution at most its weight times the optimal cost
+            stats.bound = bound if limited else min(open_list.weight, bound)
+            if limited or stats.bound <= 1 or open_list.weight <= 1:
+                break
+
+            # lower the weight, move the improved nodes back into the open list and start the next search
+            for node in incons.values():
+                open_list.push(node)
+            incons = {}
+            closed = set()
+            open_list.reweight(max(1, open_list.weight - step))
+
+        # rebuild the path of the best solution, and prepend its cost (g) and the counter of expanded nodes to it
+        # (for reference in calling code)
+        return SearchResult([solution.g, counter] + solution.get_path(), stats)
+    finally:
+        stats.stop()
@@ -0,0 +1,122 @@
+# Import the libraries needed to read instances, run them in parallel and write the results
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from board import check_validity
+from budget import Budget, SearchLimitExceeded
+from heuristics import HEURISTICS
+from search_stats import SearchStats
+from solvers import SOLVERS
+
+
+def solve_instance(index, instance, search, algo, max_nodes, time_limit, profile=False):
+    """
+    solve_instance is the function run in a worker process to solve one instance within its budget
+    :param index: the line number of the instance in the input, used as its id if the instance has none
+    :param instance: a dictionary holding the 'start' and 'goal' 2D arrays, and optionally an 'id'
+    :param search: the name of the search strategy, one of the keys of SOLVERS
+    :param algo: the name of the heuristic algorithm, one of the keys of HEURISTICS
+    :param max_nodes: the largest number of nodes the search may expand, None for no limit
+    :param time_limit: the number of seconds the search may run for, None for no limit
+    :param profile: True to time the heuristic separately in the statistics, which slows the search down
+    :return: a dictionary holding the result of the instance, with the statistics of the search if it finished
+    """
+    res = {"id": index, "status": "solved", "cost": None, "moves": None, "expanded": None}
+    st = time.time()
+    try:
+        res["id"] = instance.get("id", index)
+        # a line which could not be read holds the reason instead of the boards
+        if "error" in instance:
+            raise ValueError(instance["error"])
+        start_board = instance["start"]
+        goal_board = instance["goal"]
+        if not check_validity(start_board) or not check_validity(goal_board) or len(start_board) != len(goal_board):
+            raise ValueError("Board is NOT a valid board")
+        solution = SOLVERS[search](start_board, goal_board, algo, Budget(max_nodes, time_limit),
+                                   SearchStats(profile=profile))
+        res["stats"] = solution.stats.as_dict()
+        if len(solution) == 0:
+            res["status"] = "unsolvable"
+        else:
+            res["cost"] = solution[0]
+            res["expanded"] = solution[1]
+            res["moves"] = solution[2:]
+    except SearchLimitExceeded as e:
+        res["status"] = "limit"
+        res["error"] = e.message
+    except (AttributeError, KeyError, RuntimeError, TypeError, ValueError) as e:
+        res["status"] = "error"
+        res["error"] = str(e)
+    res["time"] = time.time() - st
+    return res
+
+
+def read_instances(stream):
+    """
+    generator to read instances from a stream of JSON lines, one instance per line, blank lines are skipped
+    :param stream: a file object to read from
+    :return: yields tuples of the line number and the instance dictionary (or the error if the line is not valid JSON)
+    """
+    for index, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield index, json.loads(line)
+        except ValueError as e:
+            yield index, {"error": "Line is NOT valid JSON: " + str(e)}
+
+
+def main():
+    """
+    reads start and goal board pairs, solves them in parallel and writes a JSON line per result as each one finishes
+    each input line is a JSON object such as {"id": 1, "start": [[1, 2, 3], ...], "goal": [[1, 2, 3], ...]}
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Solve N-Puzzle instances in parallel, without the GUI")
+    parser.add_argument("input", nargs="?", default="-", help="file of JSON lines to read, '-' for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="file to write JSON lines to, '-' for stdout (default)")
+    parser.add_argument("--search", default="A*", choices=list(SOLVERS), help="search strategy (default A*)")
+    parser.add_argument("--heuristic", default="Manhattan", choices=list(HEURISTICS),
+                        help="heuristic algorithm (default Manhattan)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--max-nodes", type=int, default=None, help="node budget per instance")
+    parser.add_argument("--time-limit", type=float, default=None, help="time budget per instance, in seconds")
+    parser.add_argument("--profile", action="store_true",
+                        help="time the heuristic separately in the statistics (slows the searches down)")
+    args = parser.parse_args()
+
+    in_stream = sys.stdin if args.input == "-" else open(args.input)
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w")
+    instances = read_instances(in_stream)
+    # keep a few instances queued per worker, so a large input is streamed rather than read in all at once
+    max_pending = 4 * args.workers
+    pending = set()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        while True:
+            # top up the queue of instances
+            for index, instance in instances:
+                pending.add(executor.submit(solve_instance, index, instance, args.search, args.heuristic,
+                                            args.max_nodes, args.time_limit, args.profile))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                break
+            # write the results of the instances which have finished, in the order they finish
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                out_stream.write(json.dumps(future.result()) + "\n")
+            out_stream.flush()
+
+    if in_stream is not sys.stdin:
+        in_stream.close()
+    if out_stream is not sys.stdout:
+        out_stream.close()
+
+
+if __name__ == "__main__":
+    main()
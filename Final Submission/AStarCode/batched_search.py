@@ -0,0 +1,413 @@
+# Import numpy to expand many boards at once, and the Board Class and heuristics
+import numpy as np
+from board import Board
+from budget import SearchLimitExceeded
+from heuristics import TileHeuristic, get_heuristic
+from search_stats import SearchResult, SearchStats
+
+# The number of boards the batched best first search expands at once
+BATCH_SIZE = 1024
+# The number of boards the beam search keeps in each layer
+BEAM_WIDTH = 2000
+
+
+class BatchExpander:
+    """
+    Class to represent the tables needed to expand an array of packed boards at once with numpy
+    the packed states of Board (4 bits per tile for boards up to 4x4) fit in a uint64, so a batch of boards is an array
+    of states and an array of the positions of their blanks. Only heuristics which sum a per tile cost table (Manhattan
+    and Hamming) can be scored this way, as the child's heuristic is the parent's plus the change in cost of one tile
+    """
+
+    def __init__(self, layout, heuristic=None):
+        """
+        the init function builds the move table and cost table as numpy arrays
+        :param layout: the Layout of the boards
+        :param heuristic: the Heuristic of the search prepared for the goal board, None to expand without scoring
+        """
+        if layout.cells * layout.bits > 64:
+            raise ValueError("THE BATCHED SEARCHES ONLY SOLVE BOARDS UP TO 4x4")
+        self.cells = layout.cells
+        self.bits = np.uint64(layout.bits)
+        self.mask = np.uint64(layout.mask)
+        # the move table, padded with -1 where the blank has fewer than 4 moves
+        self.moves = np.full((layout.cells, 4), -1, dtype=np.int64)
+        for blank, points in enumerate(layout.neighbours):
+            self.moves[blank, :len(points)] = points
+        # the cost of every tile in every position, as in the heuristic
+        self.table = None
+        if heuristic is not None:
+            if not isinstance(heuristic, TileHeuristic) or type(heuristic).child_h is not TileHeuristic.child_h:
+                raise ValueError("THE BATCHED SEARCHES ONLY USE PER TILE HEURISTICS, SUCH AS MANHATTAN AND HAMMING")
+            self.table = np.array(heuristic.table, dtype=np.int64)
+
+    def find_blanks(self, states):
+        """
+        function to find the position of the blank in each of an array of packed boards
+        :param states: a uint64 array of the packed boards
+        :return: an int64 array of the positions of the blanks
+        """
+        blanks = np.zeros(len(states), dtype=np.int64)
+        for pos in range(1, self.cells):
+            blanks[((states >> (np.uint64(pos) * self.bits)) & self.mask) == 0] = pos
+        return blanks
+
+    def expand(self, states, blanks, hs=None):
+        """
+        function to generate every successor of a batch of boards, and their heuristics
+        :param states: a uint64 array of the packed boards
+        :param blanks: an int64 array of the positions of the blanks
+        :param hs: an int64 array of the heuristics of the boards, None if the expander has no heuristic
+        :return: a tuple of arrays of the successors: their packed boards, the positions of their blanks, their
+                 heuristics (None without a heuristic), the index of their parent in the batch and the tile moved to
+                 reach them
+        """
+        targets = self.moves[blanks]
+        parents = np.broadcast_to(np.arange(len(states))[:, None], targets.shape)
+        # drop the padding of the move table
+        valid = targets >= 0
+        targets = targets[valid]
+        parents = parents[valid]
+        old_blanks = blanks[parents]
+        parent_states = states[parents]
+        # read the tile next to the blank, and move it into the blank (which holds 0) with one subtraction and addition
+        src_shift = targets.astype(np.uint64) * self.bits
+        dst_shift = old_blanks.astype(np.uint64) * self.bits
+        tiles = (parent_states >> src_shift) & self.mask
+        children = parent_states - (tiles << src_shift) + (tiles << dst_shift)
+        # only the moved tile changes its cost
+        tiles = tiles.astype(np.int64)
+        child_hs = None
+        if hs is not None:
+            child_hs = hs[parents] - self.table[tiles, targets] + self.table[tiles, old_blanks]
+        return children, targets, child_hs, parents, tiles
+
+
+class StateSet:
+    """
+    Class to represent a set of packed boards as a few sorted uint64 arrays, so a whole batch can be looked up at once
+    with a binary search. Arrays are merged when they reach a similar size, so there are only log(n) of them
+    """
+
+    def __init__(self):
+        """
+        the init function creates an empty set
+        """
+        self.chunks = []
+
+    def __len__(self):
+        """
+        overriding the 'len' function to return the number of boards in the set
+        :return: integer number of boards
+        """
+        return sum(len(chunk) for chunk in self.chunks)
+
+    def contains(self, states):
+        """
+        function to look up an array of boards in the set
+        :param states: a uint64 array of packed boards
+        :return: a boolean array of whether each board is in the set
+        """
+        found = np.zeros(len(states), dtype=bool)
+        for chunk in self.chunks:
+            index = np.minimum(np.searchsorted(chunk, states), len(chunk) - 1)
+            found |= chunk[index] == states
+        return found
+
+    def add(self, states):
+        """
+        function to add an array of boards to the set, none of which may already be in it
+        :param states: a uint64 array of packed boards
+        :return: None
+        """
+        if len(states) == 0:
+            return
+        self.chunks.append(np.sort(states))
+        # merge the newest array into the one before it while they are of a similar size
+        while len(self.chunks) > 1 and len(self.chunks[-2]) <= 2 * len(self.chunks[-1]):
+            last = self.chunks.pop()
+            self.chunks[-1] = np.union1d(self.chunks[-1], last)
+
+
+class BucketQueue:
+    """
+    Class to represent the open list of the batched best first search, the boards are kept as arrays in a bucket for
+    each f value, so a batch can be taken from the smallest f values without sorting the whole open list
+    """
+
+    def __init__(self):
+        """
+        the init function creates an empty open list
+        """
+        # the buckets map an f value to an array of (states, blanks, gs, hs) tuples of arrays
+        self.buckets = {}
+        self.size = 0
+
+    def __len__(self):
+        """
+        overriding the 'len' function to return the number of boards in the open list
+        :return: integer number of boards
+        """
+        return self.size
+
+    def push(self, states, blanks, gs, hs):
+        """
+        function to add arrays of boards to the open list
+        :param states: a uint64 array of the packed boards
+        :param blanks: an int64 array of the positions of the blanks
+        :param gs: an int64 array of the costs of the boards
+        :param hs: an int64 array of the heuristics of the boards
+        :return: None
+        """
+        fs = gs + hs
+        # a batch only spans a few f values, so split it into one chunk per f value
+        for f in np.unique(fs):
+            chosen = fs == f
+            self.buckets.setdefault(int(f), []).append((states[chosen], blanks[chosen], gs[chosen], hs[chosen]))
+        self.size += len(states)
+
+    def pop(self, count):
+        """
+        function to remove and return up to 'count' boards with the smallest f values, the newest boards are taken
+        first within an f value, which favours the deeper boards
+        :param count: the largest number of boards to take
+        :return: a tuple of arrays of the boards taken: their packed boards, the positions of their blanks, their
+                 costs and their heuristics
+        """
+        taken = []
+        needed = count
+        while needed > 0 and self.buckets:
+            f = min(self.buckets)
+            chunks = self.buckets[f]
+            chunk = chunks.pop()
+            if len(chunk[0]) > needed:
+                # split the chunk, and put back the part which is not needed
+                chunks.append(tuple(array[needed:] for array in chunk))
+                chunk = tuple(array[:needed] for array in chunk)
+            if not chunks:
+                del self.buckets[f]
+            taken.append(chunk)
+            needed -= len(chunk[0])
+        self.size -= count - needed
+        return tuple(np.concatenate(arrays) for arrays in zip(*taken))
+
+
+class BatchedSearch:
+    """
+    Class to represent the shared parts of the batched searches, the seen set and the record of how each board was
+    reached, which is used to rebuild the path once the goal is found
+    """
+
+    def __init__(self, start, goal, heuristic):
+        """
+        the init function prepares the expander and records the start board
+        :param start: the start Board
+        :param goal: the goal Board
+        :param heuristic: the Heuristic of the search, prepared for the goal board
+        """
+        self.expander = BatchExpander(start.layout, heuristic)
+        self.start_state = np.uint64(start.state)
+        self.goal_state = np.uint64(goal.state)
+        self.seen = StateSet()
+        self.seen.add(np.array([start.state], dtype=np.uint64))
+        # the boards reached, the board each was reached from and the tile moved, one array of each per batch
+        self.reached = []
+        self.parents = []
+        self.moves = []
+
+    def expand(self, states, blanks, gs, hs):
+        """
+        function to expand a batch of boards and keep only the successors which have not been seen before
+        :param states: a uint64 array of the packed boards
+        :param blanks: an int64 array of the positions of the blanks
+        :param gs: an int64 array of the costs of the boards
+        :param hs: an int64 array of the heuristics of the boards
+        :return: a tuple of the number of successors generated and arrays of the new successors: their packed boards,
+                 the positions of their blanks, their costs and their heuristics
+        """
+        children, child_blanks, child_hs, parents, tiles = self.expander.expand(states, blanks, hs)
+        child_gs = gs[parents] + 1
+        generated = len(children)
+        # sort by board then cost, and keep the cheapest successor of each board in the batch
+        order = np.lexsort((child_gs, children))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = children[order[1:]] != children[order[:-1]]
+        keep = order[first]
+        # drop the successors which have been seen before, in bulk
+        keep = keep[~self.seen.contains(children[keep])]
+        self.seen.add(children[keep])
+        self.reached.append(children[keep])
+        self.parents.append(states[parents[keep]])
+        self.moves.append(tiles[keep])
+        return generated, children[keep], child_blanks[keep], child_gs[keep], child_hs[keep]
+
+    def get_path(self):
+        """
+        function to rebuild the moves from the start board to the goal board, from the record of how each was reached
+        :return: an array of the tiles moved, in order
+        """
+        reached = np.concatenate(self.reached)
+        parents = np.concatenate(self.parents)
+        moves = np.concatenate(self.moves)
+        order = np.argsort(reached)
+        reached = reached[order]
+        path = []
+        state = self.goal_state
+        while state != self.start_state:
+            index = order[np.searchsorted(reached, state)]
+            path.append(int(moves[index]))
+            state = parents[index]
+        path.reverse()
+        return path
+
+
+def batched_best_first(start_board, goal_board, algo, budget=None, stats=None, batch=BATCH_SIZE):
+    """
+    batched_best_first is a function which searches for a path from the start to the goal board by expanding the
+    'batch' boards with the smallest f value at once, with every successor generated, scored and checked against the
+    boards already seen in a few numpy operations rather than one Node at a time.
+    this is NOT optimal, a batch holds boards with larger f values than the best one, boards are never reopened and the
+    goal is accepted as soon as it is generated, but the path found is usually close to the shortest
+    :param start_board: A 2D Array containing values for the start board (up to 4x4)
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: the name of the heuristic algorithm to use, which must be a per tile heuristic
+    :param budget: a Budget limiting the number of nodes expanded and the time taken, None for no limit
+    :param stats: a SearchStats to fill in (with any hooks or profiler to run), None to create a new one. the hooks are
+                  called once per batch, with None as the node
+    :param batch: the number of boards to expand at once
+    :return: A SearchResult is returned containing the cost, the number of boards expanded and the individual moves
+             required to get from the start to goal node (empty if the puzzle is unsolvable), and the statistics
+    """
+
+    if stats is None:
+        stats = SearchStats()
+    stats.start()
+    try:
+        # Set the global 'algo' variable of board to the passed in algorithm string
+        Board.algo = algo
+        # Create the start and goal boards, and prepare the heuristic for the goal board once for the whole search
+        start = Board(start_board)
+        goal = Board(goal_board)
+        heuristic = get_heuristic(algo, goal)
+        search = BatchedSearch(start, goal, heuristic)
+        # the search is not optimal, so there is no bound on the cost of the solution
+        stats.bound = None
+
+        # the goal could only be found by exhausting every reachable board, so check the parity of the boards first
+        if not start.is_solvable(goal):
+            return SearchResult([], stats)
+        if start == goal:
+            return SearchResult([0, 0], stats)
+
+        # the open list holds arrays of the packed boards, the positions of their blanks, their costs and heuristics
+        open_list = BucketQueue()
+        open_list.push(np.array([start.state], dtype=np.uint64), np.array([start.blank], dtype=np.int64),
+                       np.zeros(1, dtype=np.int64), np.array([heuristic.evaluate(start)], dtype=np.int64))
+
+        # set a counter to count the number of boards expanded
+        counter = 0
+        while len(open_list) > 0:
+            # take the boards with the smallest f values out of the open list
+            states, blanks, gs, hs = open_list.pop(batch)
+            counter += len(states)
+            # stop the search if it has run out of its budget
+            if budget is not None:
+                budget.charge(counter)
+            stats.expand_batch(len(states), int((gs + hs).min()), len(open_list), len(search.seen))
+
+            generated, states, blanks, gs, hs = search.expand(states, blanks, gs, hs)
+            stats.generated += generated
+            stats.duplicates_closed += generated - len(states)
+
+            # check if the goal was generated
+            hit = np.flatnonzero(states == search.goal_state)
+            if len(hit) > 0:
+                # rebuild the path and prepend the cost (g) and counter of expanded boards to it (for reference in
+                # calling code)
+                return SearchResult([int(gs[hit[0]]), counter] + search.get_path(), stats)
+
+            # put the new successors into the open list
+            open_list.push(states, blanks, gs, hs)
+
+        # if the code reaches here, assume the problem is unsolvable, and return an empty list
+        return SearchResult([], stats)
+    finally:
+        stats.stop()
+
+
+def beam_search(start_board, goal_board, algo, budget=None, stats=None, width=BEAM_WIDTH):
+    """
+    beam_search is a function which searches for a path from the start to the goal board one layer (number of moves)
+    at a time, keeping only the 'width' boards of each layer with the smallest heuristic. Each layer is expanded in a
+    few numpy operations, as in batched_best_first.
+    this is NOT optimal and may fail to find a solution at all, if every path to the goal leaves the beam, in which
+    case SearchLimitExceeded is raised, a wider beam may then find a solution
+    :param start_board: A 2D Array containing values for the start board (up to 4x4)
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: the name of the heuristic algorithm to use, which must be a per tile heuristic
+    :param budget: a Budget limiting the number of nodes expanded and the time taken, None for no limit
+    :param stats: a SearchStats to fill in (with any hooks or profiler to run), None to create a new one. the hooks are
+                  called once per layer, with None as the node
+    :param width: the number of boards to keep in each layer
+    :return: A SearchResult is returned containing the cost, the number of boards expanded and the individual moves
+             required to get from the start to goal node (empty if the puzzle is unsolvable), and the statistics
+    """
+
+    if stats is None:
+        stats = SearchStats()
+    stats.start()
+    try:
+        # Set the global 'algo' variable of board to the passed in algorithm string
+        Board.algo = algo
+        # Create the start and goal boards, and prepare the heuristic for the goal board once for the whole search
+        start = Board(start_board)
+        goal = Board(goal_board)
+        heuristic = get_heuristic(algo, goal)
+        search = BatchedSearch(start, goal, heuristic)
+        # the search is not optimal, so there is no bound on the cost of the solution
+        stats.bound = None
+
+        # the beam would only run out on an unsolvable puzzle after exhausting every reachable board, so check the
+        # parity of the boards first
+        if not start.is_solvable(goal):
+            return SearchResult([], stats)
+        if start == goal:
+            return SearchResult([0, 0], stats)
+
+        # the layer as arrays of the packed boards, the positions of their blanks, their costs and heuristics
+        states = np.array([start.state], dtype=np.uint64)
+        blanks = np.array([start.blank], dtype=np.int64)
+        gs = np.zeros(1, dtype=np.int64)
+        hs = np.array([heuristic.evaluate(start)], dtype=np.int64)
+
+        # set a counter to count the number of boards expanded
+        counter = 0
+        while len(states) > 0:
+            counter += len(states)
+            # stop the search if it has run out of its budget
+            if budget is not None:
+                budget.charge(counter)
+            stats.expand_batch(len(states), int((gs + hs).min()), len(states), len(search.seen))
+
+            generated, states, blanks, gs, hs = search.expand(states, blanks, gs, hs)
+            stats.generated += generated
+            stats.duplicates_closed += generated - len(states)
+
+            # check if the goal was generated
+            if np.any(states == search.goal_state):
+                # every board in the layer has the same cost, prepend it and the counter of expanded boards to the
+                # path (for reference in calling code)
+                return SearchResult([int(gs[0]), counter] + search.get_path(), stats)
+
+            # keep the boards of the new layer with the smallest heuristic
+            if len(states) > width:
+                kept = np.argpartition(hs, width)[:width]
+                states = states[kept]
+                blanks = blanks[kept]
+                gs = gs[kept]
+                hs = hs[kept]
+
+        # every board left the beam without reaching the goal
+        raise SearchLimitExceeded("Beam search ran out of boards before finding a solution, try a wider beam")
+    finally:
+        stats.stop()
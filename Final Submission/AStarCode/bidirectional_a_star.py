@@ -0,0 +1,108 @@
+# Import the Node and Board Classes from their respective files
+import time
+from node import Node
+from board import Board
+from frontier import Frontier
+from heuristics import get_heuristic
+from search_stats import SearchResult, SearchStats
+
+
+def bidirectional_a_star(start_board, goal_board, algo, budget=None, stats=None):
+    """
+    bidirectional_a_star is a function which takes a start and goal board layout and runs two A* searches at once, one
+    forward from the start towards the goal and one backward from the goal towards the start, to find the shortest
+    number of moves to reach this goal. Moves can be undone, so the backward search uses the same successors.
+    whenever a board is reached by both searches, the two paths to it make a solution. The best solution found is
+    optimal once it is no longer than the smallest f value of either open list, as every unexplored path through that
+    open list costs at least that much
+    :param start_board: A 2D Array containing values for the start board
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: the name of the heuristic algorithm to use
+    :param budget: a Budget limiting the number of nodes expanded and the time taken, None for no limit
+    :param stats: a SearchStats to fill in (with any hooks or profiler to run), None to create a new one
+    :return: A SearchResult is returned containing the cost, the number of nodes expanded and the individual moves
+             required to get from the start to goal node (empty if the puzzle is unsolvable), and the statistics.
+             the open and closed list sizes in the statistics are the totals of both searches
+    """
+
+    if stats is None:
+        stats = SearchStats()
+    stats.start()
+    try:
+        # Set the global 'algo' variable of board to the passed in algorithm string
+        Board.algo = algo
+        start = Board(start_board)
+        goal = Board(goal_board)
+
+        # the searches would have to exhaust both halves of the reachable boards, so check the parity of the boards
+        # first
+        if not start.is_solvable(goal):
+            return SearchResult([], stats)
+
+        # each search has its own heuristic (towards the other end), open list and closed list
+        # the closed lists map the board of each searched node to the node, so a meeting point can rebuild its path
+        heuristics = (stats.timed(get_heuristic(algo, goal)), stats.timed(get_heuristic(algo, start)))
+        open_lists = (Frontier(), Frontier())
+        closed_lists = ({}, {})
+        open_lists[0].push(Node(start, None, None, 0, heuristics[0].evaluate(start)))
+        open_lists[1].push(Node(goal, None, None, 0, heuristics[1].evaluate(goal)))
+
+        # the cost of the best solution found so far, and the forward and backward nodes which meet on it
+        best = 0 if start == goal else float("inf")
+        meeting = (open_lists[0].peek(), open_lists[1].peek()) if start == goal else None
+
+        # set a counter to count the number of nodes expanded by both searches
+        counter = 0
+        # while both searches have nodes left and could still find a shorter solution
+        while len(open_lists[0]) > 0 and len(open_lists[1]) > 0:
+            if best <= max(open_lists[0].peek().f, open_lists[1].peek().f):
+                break
+            counter += 1
+            # stop the search if it has run out of its budget
+            if budget is not None:
+                budget.charge(counter)
+
+            # expand the search with the smaller open list, 0 is forward and 1 is backward
+            side = 0 if len(open_lists[0]) <= len(open_lists[1]) else 1
+            open_list, closed_list = open_lists[side], closed_lists[side]
+            other_open, other_closed = open_lists[1 - side], closed_lists[1 - side]
+
+            current = open_list.pop()
+            closed_list[current.board] = current
+            stats.expand(current, len(open_list) + len(other_open), len(closed_list) + len(other_closed))
+
+            st = time.perf_counter()
+            successors = current.get_successors(heuristics[side])
+            stats.generate_time += time.perf_counter() - st
+            stats.generated += len(successors)
+            for node in successors:
+                # discard the successor if its board was already searched at no greater cost, otherwise reopen it
+                closed = closed_list.get(node.board)
+                if closed is not None:
+                    if closed.g <= node.g:
+                        stats.duplicates_closed += 1
+                        continue
+                    del closed_list[node.board]
+                # if the other search has reached this board, the two paths to it make a solution
+                other = other_closed.get(node.board)
+                if other is None:
+                    other = other_open.get(node)
+                if other is not None and node.g + other.g < best:
+                    best = node.g + other.g
+                    meeting = (node, other) if side == 0 else (other, node)
+                # a successor which cannot lead to a shorter solution than the best one is not worth searching
+                if node.f < best and not open_list.push(node):
+                    stats.duplicates_open += 1
+
+        if meeting is None:
+            # if the code reaches here, assume the problem is unsolvable, and return an empty list
+            return SearchResult([], stats)
+
+        # the forward path leads from the start to the meeting board, and the backward path leads from the goal to
+        # it, undoing a move moves the same tile, so the backward path reversed leads from the meeting board to the
+        # goal
+        moves = meeting[0].get_path() + meeting[1].get_path()[::-1]
+        # prepend the cost and counter of expanded nodes to the moves array (for reference in calling code)
+        return SearchResult([best, counter] + moves, stats)
+    finally:
+        stats.stop()
@@ -1,29 +1,143 @@
-# Import the deepcopy function from the copy library
-from copy import deepcopy
+def get_neighbours(size):
+    """
+    function to precompute the positions the blank tile can move to from every position of the board
+    positions are numbered row by row, starting from 0 in the top left corner
+    :param size: the number of rows and columns in the board
+    :return: a tuple holding, for each position, a tuple of the neighbouring positions (up, down, left, right)
+    """
+    res = []
+    for pos in range(0, size * size):
+        row, col = divmod(pos, size)
+        points = []
+        # Consider 4 possible moves for the blank tile, if the move stays on the board then store the new position
+        if row > 0:
+            points.append(pos - size)
+        if row < size - 1:
+            points.append(pos + size)
+        if col > 0:
+            points.append(pos - 1)
+        if col < size - 1:
+            points.append(pos + 1)
+        res.append(tuple(points))
+    return tuple(res)
+
+
+class Layout:
+    """
+    Class to represent the shape of an NxN board, shared by every board of the same size
+    """
+    # Class Variable to cache one layout per board size
+    layouts = {}
+    # Fix the attributes of a layout, so each instance does not need a dictionary
+    __slots__ = ("size", "cells", "bits", "mask", "neighbours")
+
+    def __init__(self, size):
+        """
+        the init function precomputes the packing parameters and the move table for a board size
+        :param size: the number of rows and columns in the board
+        """
+        self.size = size
+        self.cells = size * size
+        # the number of bits used to store each tile in the packed state, at least 4, enough for the largest tile
+        self.bits = max(4, (self.cells - 1).bit_length())
+        # a mask to extract a single tile from the packed state
+        self.mask = (1 << self.bits) - 1
+        # the move table, neighbours[blank] holds the positions the blank tile at 'blank' can move to
+        self.neighbours = get_neighbours(size)
+
+    @classmethod
+    def get(cls, size):
+        """
+        function to return the layout for a board size, creating it the first time the size is used
+        :param size: the number of rows and columns in the board
+        :return: the Layout instance
+        """
+        if size not in cls.layouts:
+            cls.layouts[size] = Layout(size)
+        return cls.layouts[size]
 
 
 class Board:
     """
-    Class to represent a Board in the 8-Puzzle
+    Class to represent a Board in the N-Puzzle (8-Puzzle, 15-Puzzle, 24-Puzzle, ...)
+    the board is packed into a single integer 'state', with layout.bits bits per tile and position 0 in the lowest
+    bits, and the position of the blank tile is cached in 'blank'
     """
     # Class Variable to set the choice of algorithm
     algo = ""
+    # Fix the attributes of a board, so each instance does not need a dictionary
+    __slots__ = ("state", "blank", "layout")
 
 
     def __init__(self, elems):
         """
-        the init function initialises the board object and sets the 'brd' attribute to the passed in 2D array
-        :param elems: A 2D array of elements for the board
+        the init function initialises the board object by packing the passed in 2D array into the 'state' attribute
+        :param elems: A square 2D array of elements for the board
+        """
+        self.layout = Layout.get(len(elems))
+        self.state = 0
+        self.blank = 0
+        # for each tile in the board, read row by row
+        for pos, num in enumerate(num for row in elems for num in row):
+            # store the tile in its bits of the state, and remember the position of the blank tile
+            self.state |= num << (pos * self.layout.bits)
+            if num == 0:
+                self.blank = pos
+
+    @classmethod
+    def from_state(cls, state, blank, layout):
+        """
+        function to create a board directly from a packed state, without going through a 2D array
+        :param state: the packed integer representation of the board
+        :param blank: the position of the blank tile
+        :param layout: the Layout of the board
+        :return: the Board instance
         """
-        self.brd = elems
+        board = cls.__new__(cls)
+        board.state = state
+        board.blank = blank
+        board.layout = layout
+        return board
+
+    @property
+    def size(self):
+        """
+        the number of rows and columns in the board
+        :return: an integer size
+        """
+        return self.layout.size
+
+    @property
+    def brd(self):
+        """
+        the 2D array representation of the board, generated from the packed state (used by the GUI and for output)
+        :return: A 2D array of elements for the board
+        """
+        size = self.layout.size
+        return [[self.tile(row * size + col) for col in range(0, size)] for row in range(0, size)]
 
     def __eq__(self, other):
         """
-        overriding the 'eq' function to allow two boards to be compared via the 'brd' attribute only
+        overriding the 'eq' function to allow two boards to be compared via the 'state' attribute only
         :param other: a Board instance of the board to compare this board with
         :return: return a boolean of whether the two boards are equal or not
         """
-        return self.brd == other.brd
+        return self.state == other.state
+
+    def __hash__(self):
+        """
+        overriding the 'hash' function so boards with the same layout can be used as the same set or dict key
+        :return: an integer hash of the 'state' attribute
+        """
+        return hash(self.state)
+
+    def tile(self, pos):
+        """
+        function to read the value of a tile from the packed state
+        :param pos: the position of the tile
+        :return: the integer value of the tile at that position
+        """
+        return (self.state >> (pos * self.layout.bits)) & self.layout.mask
 
     def locate(self, num):
         """
@@ -31,80 +145,112 @@ class Board:
         :param num: The number to find in the board
         :return: a tuple containing the row and col location of the value in question
         """
-        # for reach row
-        for row in range(0, len(self.brd)):
-            # for each col
-            for col in range(0, len(self.brd[row])):
-                if self.brd[row][col] == num:
-                    # if the value at that row and col combination, return these row and col values
-                    return (row, col)
+        # the blank tile is cached, so it does not need to be searched for
+        if num == 0:
+            return divmod(self.blank, self.layout.size)
+        # for each position
+        for pos in range(0, self.layout.cells):
+            if self.tile(pos) == num:
+                # if the value at that position is the number, return its row and col values
+                return divmod(pos, self.layout.size)
+
+    def locate_all(self):
+        """
+        function to find the coordinates of every value in the board at once
+        :return: an array of positions, indexed by the value of the tile
+        """
+        positions = [0] * self.layout.cells
+        state = self.state
+        # read the tiles out of the packed state, from position 0 upwards
+        for pos in range(0, self.layout.cells):
+            positions[state & self.layout.mask] = pos
+            state >>= self.layout.bits
+        return positions
+
+    def parity(self):
+        """
+        function to calculate the parity of the board, a move never changes it, so two boards can only be reached
+        from each other if they have the same parity
+        the parity is the number of inversions (pairs of tiles in the wrong order, read row by row, ignoring the
+        blank) and, for boards with an even size, the row of the blank tile
+        :return: 0 or 1
+        """
+        tiles = [num for num in (self.tile(pos) for pos in range(0, self.layout.cells)) if num != 0]
+        inversions = 0
+        for i in range(0, len(tiles)):
+            for j in range(i + 1, len(tiles)):
+                if tiles[i] > tiles[j]:
+                    inversions += 1
+        # on an odd sized board a vertical move changes the inversions by an even number, so they decide the parity
+        if self.layout.size % 2 == 1:
+            return inversions % 2
+        # on an even sized board a vertical move changes the inversions by an odd number and the blank row by one
+        return (inversions + self.blank // self.layout.size) % 2
+
+    def is_solvable(self, goal):
+        """
+        function to check whether the goal board can be reached from this board, without searching
+        :param goal: the goal Board
+        :return: a Boolean of whether the goal can be reached
+        """
+        return self.layout is goal.layout and self.parity() == goal.parity()
 
     def get_heuristic(self, goal):
         """
-        calls the correct heuristic function based on the heuristic algorithm selected to use
-        :param goal: the goal state of the node
-        :return: an integer returned by the heuristic function
-        """
-        if self.algo == "Hamming":
-            # If the 'algo' is Hamming, call the get_heuristic_hamming function
-            return self.get_heuristic_hamming(goal)
-        elif self.algo == "Manhattan":
-            # otherwise, if 'algo' is Manhattan, call the get_heuristic_manhattan function
-            return self.get_heuristic_manhattan(goal)
-        else:
-            # otherwise, there is an error, exit the code in this case
-            print("NOT A VALID HEURISTIC ALGORITHM")
-            exit(1)
-
-    def get_heuristic_hamming(self, goal):
-        """
-        uses the hamming method to return a value for the heuristic of the node
-        :param goal: the goal state of the node
-        :return: an integer which is the heuristic
-        """
-        # set the heuristic to 0
-        heuristic = 0
-        # iterate through each element of the goal board
-        for row in range(0, len(goal.brd)):
-            for col in range(0, len(goal.brd[row])):
-                # if the tile in each position is out of place and not the blank tile, then increment the heuristic
-                if goal.brd[row][col] != self.brd[row][col] and goal.brd[row][col] != 0:
-                    heuristic += 1
-        # return the heuristic
-        return heuristic
-
-    def get_heuristic_manhattan(self, goal):
-        """
-        uses the manhattan method to return a value for the heuristic of the node
+        evaluates the heuristic algorithm selected to use on this board, using the registry of heuristics
+        searches should prepare the heuristic once with heuristics.get_heuristic instead of calling this per node
         :param goal: the goal state of the node
-        :return: an integer which is the heuristic
+        :return: an integer returned by the heuristic
         """
-        # set the heuristic to 0
-        heuristic = 0
-
-        # for each tile possibility
-        for num in range(0, 9):
-            # find the coordinates of this value in the current board and the goal board
-            current_loc = self.locate(num)
-            goal_loc = goal.locate(num)
-            # generate the distance using the manhattan method formula, and add this to the heuristic
-            heuristic += (abs(current_loc[0] - goal_loc[0]) + abs(current_loc[1] - goal_loc[1]))
-        # return the heuristic
-        return heuristic
+        # imported here, as the heuristics file imports this one
+        from heuristics import get_heuristic
+        return get_heuristic(self.algo, goal).evaluate(self)
 
     def swap(self, blank, tile):
         """
-        function to swap two elements in the board
-        :param blank: coordinates of the blank tile
-        :param tile: coordinates of the tile to swap it with
+        function to move a tile into the blank space, using bit operations on the packed state
+        :param blank: position of the blank tile
+        :param tile: position of the tile to swap it with
         :return: the resulting board instance
         """
-        # make a deep copy of the board of this object
-        res = deepcopy(self.brd)
-        # print(str(res[blank[0]][blank[1]]) + "<->" + str(res[tile[0]][tile[1]]))
-        # set the blank tile to the value of the 2nd tile
-        res[blank[0]][blank[1]] = res[tile[0]][tile[1]]
-        # set the value of the 2nd tile to a 0 (making it a blank tile)
-        res[tile[0]][tile[1]] = 0
-        # return the resulting board instance
-        return Board(res)
+        bits = self.layout.bits
+        # read the value of the tile being moved
+        num = (self.state >> (tile * bits)) & self.layout.mask
+        # the blank position holds 0, so adding the tile there and subtracting it from its old position swaps the two
+        return Board.from_state(self.state + (num << (blank * bits)) - (num << (tile * bits)), tile, self.layout)
+
+
+def check_validity(input_board):
+    """
+    check_validity is a function which ensures that the 2D Array representation of the board taken in from the user
+    is of a valid format
+    * The board is square (N rows of N values)
+    * There are numbers 0, 1, 2, ... up to N*N - 1 (0 to 8 for the 8-Puzzle)
+    * There are NO blank spaces
+    * There are NO repeating values
+    :param input_board: 2D Array of board taken in from the user
+    :return: Boolean to notify the calling function whether the board is valid or not
+             * True - Valid Input
+             * False - Invalid Input
+    """
+    # check to see that the board is square
+    for row in input_board:
+        if len(row) != len(input_board):
+            return False
+    # check to see that all required numbers are in the board
+    # iterate over each required number
+    for i in range(0, len(input_board) * len(input_board)):
+        # set 'found' to false
+        found = False
+        # iterate over each value in the board
+        for row in input_board:
+            for num in row:
+                # if the number in question is found, then set the 'found' flag to true
+                if num == i:
+                    found = True
+        # at the end of the search, if the number in question hasn't been found, then return false
+        if not found:
+            return False
+    # when reaching here, all numbers are present in the code and as a side effect of this check
+    # there would be no duplicates on the board, therefore True can be returned
+    return True
@@ -0,0 +1,52 @@
+# Import the time library to enforce time limits
+import time
+
+
+class SearchLimitExceeded(Exception):
+    """
+    Define a custom exception 'SearchLimitExceeded' to throw if a search runs out of its budget
+    """
+
+    def __init__(self, message="Search ran out of its budget before finding a solution"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class SearchCancelled(SearchLimitExceeded):
+    """
+    Define a custom exception 'SearchCancelled' to throw if a search is cancelled before finding a solution
+    """
+
+    def __init__(self, message="Search was cancelled before finding a solution"):
+        super().__init__(message)
+
+
+class Budget:
+    """
+    Class to represent the limits on a search, the number of nodes it may expand and the time it may run for, and an
+    event another thread can set to cancel it
+    """
+
+    def __init__(self, max_nodes=None, time_limit=None, cancel=None):
+        """
+        the init function sets the limits, the time limit starts counting straight away
+        :param max_nodes: the largest number of nodes the search may expand, None for no limit
+        :param time_limit: the number of seconds the search may run for, None for no limit
+        :param cancel: a threading.Event which cancels the search once it is set, None if it cannot be cancelled
+        """
+        self.max_nodes = max_nodes
+        self.deadline = None if time_limit is None else time.time() + time_limit
+        self.cancel = cancel
+
+    def charge(self, counter):
+        """
+        function called by a search each time it expands a node, raises an error once a limit is passed
+        :param counter: the number of nodes the search has expanded so far
+        :return: None
+        """
+        if self.max_nodes is not None and counter > self.max_nodes:
+            raise SearchLimitExceeded("Search expanded more than " + str(self.max_nodes) + " nodes")
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchLimitExceeded("Search ran out of time")
+        if self.cancel is not None and self.cancel.is_set():
+            raise SearchCancelled()
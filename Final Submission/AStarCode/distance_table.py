@@ -0,0 +1,187 @@
+# Import the libraries needed to store the tables, the Board Class and the directory the tables are saved to
+import os
+from math import factorial
+from board import Board, get_neighbours
+from pattern_database import PDB_DIR
+from search_stats import SearchResult, SearchStats
+
+# The number of rows and columns of the boards the tables cover, every 3x3 board fits in a table of 9! entries
+SIZE = 3
+CELLS = SIZE * SIZE
+# The value stored for a board which cannot reach the goal
+UNSEEN = 255
+# The move table of the 3x3 board
+NEIGHBOURS = get_neighbours(SIZE)
+
+
+def perm_rank(tiles):
+    """
+    function to generate the rank of a permutation of the values 0 to n - 1 from its Lehmer code, every permutation
+    has a unique rank between 0 and n! - 1
+    :param tiles: a sequence of the values, read row by row
+    :return: the integer rank
+    """
+    index = 0
+    n = len(tiles)
+    for i in range(0, n):
+        # the Lehmer code digit is the number of later values smaller than this one
+        smaller = 0
+        for j in range(i + 1, n):
+            if tiles[j] < tiles[i]:
+                smaller += 1
+        index = index * (n - i) + smaller
+    return index
+
+
+class DistanceTable:
+    """
+    Class to represent the table of optimal distances of every 8-Puzzle board to a canonical goal
+    the canonical goal for a blank position holds the blank there and the tiles 1 to 8 in order in the other positions,
+    any goal with the blank in that position becomes the canonical goal by relabelling the tiles
+    """
+    # Class Variable to cache the tables of this process, one per position of the goal blank
+    tables = {}
+
+    def __init__(self, blank):
+        """
+        the init function stores the canonical goal, the table is loaded or built by 'get'
+        :param blank: the position of the blank in the canonical goal
+        """
+        self.blank = blank
+        self.goal = [0] * CELLS
+        num = 1
+        for pos in range(0, CELLS):
+            if pos != blank:
+                self.goal[pos] = num
+                num += 1
+        self.path = os.path.join(PDB_DIR, "distances_%d_%d.bin" % (SIZE, blank))
+        self.table = None
+
+    @classmethod
+    def get(cls, blank):
+        """
+        function to return the table for a position of the goal blank, loading it from its file or building and saving
+        it the first time it is used
+        :param blank: the position of the blank in the canonical goal
+        :return: the DistanceTable instance
+        """
+        if blank not in cls.tables:
+            table = DistanceTable(blank)
+            if os.path.exists(table.path):
+                with open(table.path, "rb") as f:
+                    table.table = bytearray(f.read())
+            if not table.valid():
+                # the file is missing, or was cut short or written for another goal, so build the table again
+                table.table = table.build()
+                os.makedirs(PDB_DIR, exist_ok=True)
+                # write to a temporary file and rename it, so other processes never read a half written table
+                tmp = table.path + ".%d.tmp" % os.getpid()
+                with open(tmp, "wb") as f:
+                    f.write(table.table)
+                os.replace(tmp, table.path)
+            cls.tables[blank] = table
+        return cls.tables[blank]
+
+    def valid(self):
+        """
+        function to check the table loaded from its file has an entry for every board and a distance of 0 for the goal
+        :return: True if the table can be used, False if it was not loaded or must be rebuilt
+        """
+        return (self.table is not None and len(self.table) == factorial(CELLS) and
+                self.table[perm_rank(self.goal)] == 0)
+
+    def build(self):
+        """
+        function to build the table with a breadth first search from the canonical goal
+        :return: a bytearray of distances indexed by the rank of each board, UNSEEN for boards of the other parity
+        """
+        table = bytearray([UNSEEN]) * factorial(CELLS)
+        table[perm_rank(self.goal)] = 0
+        layer = [(tuple(self.goal), self.blank)]
+        depth = 0
+        # search one layer at a time until every reachable board has a distance
+        while layer:
+            depth += 1
+            next_layer = []
+            for tiles, blank in layer:
+                for point in NEIGHBOURS[blank]:
+                    moved = list(tiles)
+                    moved[blank] = moved[point]
+                    moved[point] = 0
+                    index = perm_rank(moved)
+                    if table[index] == UNSEEN:
+                        table[index] = depth
+                        next_layer.append((tuple(moved), point))
+            layer = next_layer
+        return table
+
+    def distance(self, tiles):
+        """
+        function to look up the optimal distance of a board to the canonical goal
+        :param tiles: an array of the tiles of the board, read row by row and already relabelled
+        :return: the integer number of moves, or UNSEEN if the goal cannot be reached
+        """
+        return self.table[perm_rank(tiles)]
+
+
+def distance_table_solve(start_board, goal_board, algo=None, budget=None, stats=None):
+    """
+    distance_table_solve is a function which solves an 8-Puzzle optimally from the precomputed table of distances,
+    by always moving to a neighbouring board one move closer to the goal
+    :param start_board: A 2D Array containing values for the start board
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: unused, the table is exact so no heuristic is needed, kept so every search has the same parameters
+    :param budget: unused, the solve takes at most a few lookups per move, kept for the same reason
+    :param stats: a SearchStats to fill in, None to create a new one. no nodes are created, so the hooks are not called,
+                  the boards moved through are counted as expanded and the table lookups as generated
+    :return: A SearchResult is returned containing the cost, the number of table lookups and the individual moves
+             required to get from the start to goal node (empty if the puzzle is unsolvable), and the statistics
+    """
+
+    if stats is None:
+        stats = SearchStats()
+    stats.start()
+    try:
+        start = Board(start_board)
+        goal = Board(goal_board)
+        if start.layout.size != SIZE or goal.layout.size != SIZE:
+            raise ValueError("THE DISTANCE TABLE ONLY SOLVES 3x3 BOARDS")
+        # reject boards of the wrong parity from their inversion count, before any lookup
+        if not start.is_solvable(goal):
+            return SearchResult([], stats)
+
+        table = DistanceTable.get(goal.blank)
+        # relabel the tiles so the goal board becomes the canonical goal, and keep the reverse to report the moves
+        relabel = [0] * CELLS
+        original = [0] * CELLS
+        for pos in range(0, CELLS):
+            relabel[goal.tile(pos)] = table.goal[pos]
+            original[table.goal[pos]] = goal.tile(pos)
+        tiles = [relabel[start.tile(pos)] for pos in range(0, CELLS)]
+        blank = start.blank
+
+        # set a counter to count the number of table lookups
+        counter = 1
+        distance = table.distance(tiles)
+        cost = distance
+        moves = []
+        # descend the table, there is always a neighbouring board exactly one move closer until the goal is reached
+        while distance > 0:
+            for point in NEIGHBOURS[blank]:
+                moved = list(tiles)
+                moved[blank] = moved[point]
+                moved[point] = 0
+                counter += 1
+                if table.distance(moved) == distance - 1:
+                    moves.append(original[tiles[point]])
+                    tiles = moved
+                    blank = point
+                    distance -= 1
+                    break
+
+        stats.expanded = cost
+        stats.generated = counter
+        # prepend the cost and counter of lookups to the moves array (for reference in calling code)
+        return SearchResult([cost, counter] + moves, stats)
+    finally:
+        stats.stop()
@@ -0,0 +1,289 @@
+# Import the libraries needed to keep the layers of the search in files, and numpy to process them in chunks
+import argparse
+import os
+import shutil
+import tempfile
+import numpy as np
+from batched_search import BatchExpander
+from board import Board
+from search_stats import SearchResult, SearchStats
+
+# The default number of bytes of memory the search may use at once
+MEMORY = 64 * 1024 * 1024
+# The number of bytes used per board while expanding a chunk, for the successors and the temporary arrays
+EXPAND_BYTES = 512
+# The number of bytes of a packed board in a layer file
+STATE_BYTES = 8
+# The largest number of sorted runs merged at once, more runs are merged in several passes
+MAX_FAN_IN = 64
+
+
+def read_layer(path):
+    """
+    function to memory-map a file of packed boards, only the pages which are read are loaded into memory
+    :param path: the path of the file
+    :return: a uint64 array backed by the file
+    """
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.uint64)
+    return np.memmap(path, dtype=np.uint64, mode="r")
+
+
+def in_layer(layer, states):
+    """
+    function to look up an array of boards in a sorted layer with a binary search, which only reads the pages of the
+    layer it passes through
+    :param layer: a sorted uint64 array, usually memory-mapped
+    :param states: a uint64 array of the boards to look up
+    :return: a boolean array of whether each board is in the layer
+    """
+    if len(layer) == 0 or len(states) == 0:
+        return np.zeros(len(states), dtype=bool)
+    index = np.minimum(np.searchsorted(layer, states), len(layer) - 1)
+    return layer[index] == states
+
+
+def merge_runs(paths, out_path, exclude, block):
+    """
+    function to merge sorted files of boards into one sorted file without duplicates, streaming through the files a
+    block at a time, and dropping the boards found in any of the excluded layers
+    :param paths: an array of the paths of the sorted files
+    :param out_path: the path of the file to write
+    :param exclude: an array of sorted (memory-mapped) layers whose boards are dropped
+    :param block: the number of boards to read from each file at a time
+    :return: the number of boards written
+    """
+    runs = [read_layer(path) for path in paths]
+    offsets = [0] * len(runs)
+    written = 0
+    with open(out_path, "wb") as out:
+        while True:
+            blocks = [(i, run[offsets[i]:offsets[i] + block]) for i, run in enumerate(runs) if offsets[i] < len(run)]
+            if not blocks:
+                break
+            # no later block holds a board smaller than the smallest of the last boards of these blocks, so every
+            # board up to it can be merged now
+            bound = min(part[-1] for i, part in blocks)
+            parts = []
+            for i, part in blocks:
+                count = int(np.searchsorted(part, bound, side="right"))
+                parts.append(np.asarray(part[:count]))
+                offsets[i] += count
+            merged = np.unique(np.concatenate(parts))
+            for layer in exclude:
+                merged = merged[~in_layer(layer, merged)]
+            merged.tofile(out)
+            written += len(merged)
+    return written
+
+
+class ExternalBFS:
+    """
+    Class to represent a breadth first search which keeps its layers (the boards at each distance from the start) in
+    files of sorted packed boards rather than in memory, so the memory it needs is set by its budget and not by the
+    size of the search.
+    each layer is expanded a chunk at a time, with the successors of each chunk sorted and written to a run file, then
+    the runs are merged into the next layer, with duplicates dropped by the merge. A move is always reversible, so a
+    successor of a board is either in the next layer, or in the layer of the board or the one before it (which are
+    read through memory maps during the merge), duplicate detection is delayed until the whole layer is generated
+    """
+
+    def __init__(self, start, memory=MEMORY, directory=None, keep_layers=True):
+        """
+        the init function creates the directory of the layer files and writes the first layer
+        :param start: the Board to search from (up to 4x4)
+        :param memory: the number of bytes of memory the search may use at once
+        :param directory: the directory to create the layer files in, the system temporary directory if None
+        :param keep_layers: True to keep every layer (needed to rebuild a path), False to keep only the last two
+        """
+        self.expander = BatchExpander(start.layout)
+        self.memory = memory
+        self.chunk = max(1, memory // EXPAND_BYTES)
+        self.keep_layers = keep_layers
+        self.directory = tempfile.mkdtemp(prefix="bfs_", dir=directory)
+        np.array([start.state], dtype=np.uint64).tofile(self.layer_path(0))
+        # the depth of the last layer, the number of boards in each layer, and the number of boards expanded
+        self.depth = 0
+        self.sizes = [1]
+        self.expanded = 0
+        self.generated = 0
+
+    def layer_path(self, depth):
+        """
+        function to return the path of the file of a layer
+        :param depth: the distance of the boards in the layer from the start
+        :return: the path of the file
+        """
+        return os.path.join(self.directory, "layer_%d.bin" % depth)
+
+    def layer(self, depth):
+        """
+        function to memory-map a layer
+        :param depth: the distance of the boards in the layer from the start
+        :return: a sorted uint64 array of the boards in the layer
+        """
+        return read_layer(self.layer_path(depth))
+
+    def next_layer(self, budget=None):
+        """
+        function to expand the last layer into the next one
+        :param budget: a Budget limiting the number of boards expanded and the time taken, None for no limit
+        :return: the number of boards in the new layer
+        """
+        current = self.layer(self.depth)
+        runs = []
+        # expand the layer a chunk at a time, writing the sorted successors of each chunk to a run file
+        for lo in range(0, len(current), self.chunk):
+            states = np.asarray(current[lo:lo + self.chunk])
+            self.expanded += len(states)
+            # stop the search if it has run out of its budget
+            if budget is not None:
+                budget.charge(self.expanded)
+            children = self.expander.expand(states, self.expander.find_blanks(states))[0]
+            self.generated += len(children)
+            path = os.path.join(self.directory, "run_%d.bin" % len(runs))
+            np.unique(children).tofile(path)
+            runs.append(path)
+        del current
+
+        # merge the runs in passes of at most MAX_FAN_IN runs, only the last pass drops the boards of earlier layers
+        passes = 0
+        while len(runs) > MAX_FAN_IN:
+            passes += 1
+            merged = []
+            for i in range(0, len(runs), MAX_FAN_IN):
+                group = runs[i:i + MAX_FAN_IN]
+                path = os.path.join(self.directory, "pass_%d_%d.bin" % (passes, len(merged)))
+                merge_runs(group, path, [], self.block(len(group)))
+                for run in group:
+                    os.remove(run)
+                merged.append(path)
+            runs = merged
+        exclude = [self.layer(depth) for depth in range(max(0, self.depth - 1), self.depth + 1)]
+        size = merge_runs(runs, self.layer_path(self.depth + 1), exclude, self.block(len(runs)))
+        del exclude
+        for run in runs:
+            os.remove(run)
+
+        # the layer before the last is only needed to find duplicates of the last layer
+        if not self.keep_layers and self.depth > 0:
+            os.remove(self.layer_path(self.depth - 1))
+        self.depth += 1
+        self.sizes.append(size)
+        return size
+
+    def block(self, runs):
+        """
+        function to return the number of boards to read from each run at a time, so a merge fits in the memory budget
+        :param runs: the number of runs being merged
+        :return: the integer number of boards
+        """
+        # the blocks, their concatenation and the sorted merge are each held in memory at once
+        return max(1, self.memory // (4 * STATE_BYTES * runs))
+
+    def get_path(self, state):
+        """
+        function to rebuild the moves from the start board to a board in the last layer, by stepping back to a
+        neighbouring board in each layer before it, so the layers do not need to store how each board was reached
+        :param state: the packed board in the last layer
+        :return: an array of the tiles moved, in order
+        """
+        path = []
+        states = np.array([state], dtype=np.uint64)
+        for depth in range(self.depth - 1, -1, -1):
+            children, blanks, hs, parents, tiles = self.expander.expand(states, self.expander.find_blanks(states))
+            back = np.flatnonzero(in_layer(self.layer(depth), children))[0]
+            # the tile moved to step back is the same tile moved to step forward
+            path.append(int(tiles[back]))
+            states = children[back:back + 1]
+        path.reverse()
+        return path
+
+    def close(self):
+        """
+        function to delete the directory of the layer files
+        :return: None
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def external_bfs(start_board, goal_board, algo=None, budget=None, stats=None, memory=MEMORY, directory=None):
+    """
+    external_bfs is a function which finds the shortest number of moves from the start to the goal board with a
+    breadth first search which keeps its layers on disk, see ExternalBFS
+    :param start_board: A 2D Array containing values for the start board (up to 4x4)
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: unused, a breadth first search needs no heuristic, kept so every search has the same parameters
+    :param budget: a Budget limiting the number of nodes expanded and the time taken, None for no limit
+    :param stats: a SearchStats to fill in (with any hooks or profiler to run), None to create a new one. the hooks are
+                  called once per layer with None as the node, the peak frontier is the largest layer
+    :param memory: the number of bytes of memory the search may use at once
+    :param directory: the directory to create the layer files in, the system temporary directory if None
+    :return: A SearchResult is returned containing the cost, the number of boards expanded and the individual moves
+             required to get from the start to goal node (empty if the puzzle is unsolvable), and the statistics
+    """
+
+    if stats is None:
+        stats = SearchStats()
+    stats.start()
+    try:
+        start = Board(start_board)
+        goal = Board(goal_board)
+        # a breadth first search would have to exhaust every reachable board before giving up on an unsolvable
+        # puzzle, so check the parity of the boards first
+        if not start.is_solvable(goal):
+            return SearchResult([], stats)
+
+        goal_state = np.array([goal.state], dtype=np.uint64)
+        search = ExternalBFS(start, memory, directory)
+        try:
+            # expand one layer at a time until the goal is in the last layer
+            while not in_layer(search.layer(search.depth), goal_state)[0]:
+                stats.expand_batch(search.sizes[search.depth], search.depth, search.sizes[search.depth],
+                                   sum(search.sizes))
+                search.next_layer(budget)
+                stats.expanded = search.expanded
+                stats.generated = search.generated
+                stats.duplicates_closed = search.generated - (sum(search.sizes) - 1)
+            # rebuild the path and prepend the cost (the depth) and counter of expanded boards to it (for reference in
+            # calling code)
+            return SearchResult([search.depth, search.expanded] + search.get_path(goal.state), stats)
+        finally:
+            search.close()
+    finally:
+        stats.stop()
+
+
+def main():
+    """
+    sweeps the whole state space of a board size breadth first from a goal board, printing the number of boards at
+    each distance from it
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Breadth first sweep of the N-Puzzle state space, with the layers "
+                                                 "kept on disk")
+    parser.add_argument("size", type=int, choices=[2, 3, 4], help="the number of rows and columns")
+    parser.add_argument("--goal", type=int, nargs="+",
+                        help="the board to sweep from read row by row, defaults to 1, 2, ... with the blank (0) last")
+    parser.add_argument("--memory", type=int, default=MEMORY // (1024 * 1024), help="memory budget in megabytes")
+    parser.add_argument("--dir", default=None, help="directory for the layer files (default the temporary directory)")
+    parser.add_argument("--max-depth", type=int, default=None, help="the deepest layer to generate")
+    args = parser.parse_args()
+    cells = args.size * args.size
+    tiles = args.goal if args.goal else list(range(1, cells)) + [0]
+    start = Board([tiles[row * args.size:(row + 1) * args.size] for row in range(0, args.size)])
+
+    search = ExternalBFS(start, args.memory * 1024 * 1024, args.dir, keep_layers=False)
+    try:
+        print("Depth 0: 1 boards")
+        while search.sizes[-1] > 0 and (args.max_depth is None or search.depth < args.max_depth):
+            size = search.next_layer()
+            if size > 0:
+                print("Depth " + str(search.depth) + ": " + str(size) + " boards")
+        print("Total: " + str(sum(search.sizes)) + " boards")
+    finally:
+        search.close()
+
+
+if __name__ == "__main__":
+    main()
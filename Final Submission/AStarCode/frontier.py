@@ -0,0 +1,126 @@
+# Import the heap functions and a counter to break ties between nodes in insertion order
+import heapq
+from itertools import count
+
+
+class Frontier:
+    """
+    Class to represent the open list of the A* Algorithm as a binary heap with lazy deletion
+    nodes are ordered by g + weight * h, which is the f value of the node for the default weight of 1
+    """
+
+    def __init__(self, weight=1):
+        """
+        the init function initialises an empty heap, an empty table of live entries and the tie-break counter
+        :param weight: the weight of the heuristic in the priority of each node, above 1 for weighted A*
+        """
+        self.weight = weight
+        # the heap holds [priority, h, tie, node] entries, the smallest priority (then smallest h, then oldest) is at
+        # the top
+        self.heap = []
+        # the entries table maps a board to its live heap entry, for O(1) membership lookup
+        self.entries = {}
+        # a counter to make every entry unique, so nodes are never compared with each other
+        self.tie = count()
+
+    def __len__(self):
+        """
+        overriding the 'len' function to return the number of live nodes in the frontier
+        :return: integer number of nodes which are still waiting to be expanded
+        """
+        return len(self.entries)
+
+    def __contains__(self, node):
+        """
+        overriding the 'in' operator to check whether a node with the same board is in the frontier
+        :param node: the Node to look for
+        :return: a Boolean of whether a node with this board is waiting to be expanded
+        """
+        return node.board in self.entries
+
+    def get(self, node):
+        """
+        function to return the node in the frontier which has the same board as the node passed in
+        :param node: the Node to look for
+        :return: the Node in the frontier, or None if there is no such node
+        """
+        entry = self.entries.get(node.board)
+        if entry is None:
+            return None
+        return entry[-1]
+
+    def priority(self, node):
+        """
+        function to return the priority of a node in the frontier
+        :param node: the Node
+        :return: the number g + weight * h, the f value of the node if the weight is 1
+        """
+        if self.weight == 1:
+            return node.f
+        return node.g + self.weight * node.h
+
+    def reweight(self, weight):
+        """
+        function to change the weight of the heuristic, and reorder every node in the frontier by its new priority
+        :param weight: the new weight of the heuristic
+        :return: None
+        """
+        self.weight = weight
+        self.heap = []
+        for board, entry in self.entries.items():
+            node = entry[-1]
+            entry = [self.priority(node), node.h, next(self.tie), node]
+            self.entries[board] = entry
+            self.heap.append(entry)
+        heapq.heapify(self.heap)
+
+    def push(self, node):
+        """
+        function to add a node to the frontier
+        if a node with the same board is already in the frontier, the node with the smaller g is kept, the other one is
+        discarded (a worse entry left in the heap is marked as deleted and skipped when it reaches the top)
+        :param node: the Node to add
+        :return: a Boolean of whether the node was added to the frontier
+        """
+        # look for a node with the same board in the frontier
+        entry = self.entries.get(node.board)
+        if entry is not None:
+            # if the existing node is at least as cheap, discard the new node
+            if entry[-1].g <= node.g:
+                return False
+            # otherwise, mark the existing entry as deleted, it is skipped when popped
+            entry[-1] = None
+        # create the new entry, store it in the table and push it onto the heap
+        entry = [self.priority(node), node.h, next(self.tie), node]
+        self.entries[node.board] = entry
+        heapq.heappush(self.heap, entry)
+        return True
+
+    def peek(self):
+        """
+        function to return the node with the smallest priority (the smallest f value) without removing it
+        :return: the Node with the smallest priority
+        """
+        # drop deleted entries from the top of the heap, so the top entry is live
+        while self.heap and self.heap[0][-1] is None:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            raise IndexError("peek at an empty frontier")
+        return self.heap[0][-1]
+
+    def pop(self):
+        """
+        function to remove and return the node with the smallest priority (the smallest f value), ties are broken by
+        the smallest h value, then by insertion order
+        :return: the Node with the smallest priority
+        """
+        # keep popping entries until a live one is found
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            node = entry[-1]
+            # entries set to None have been replaced by a cheaper node with the same board, skip these
+            if node is not None:
+                del self.entries[node.board]
+                return node
+        # if the code reaches here, there are no nodes left in the frontier
+        raise IndexError("pop from an empty frontier")
@@ -0,0 +1,286 @@
+# Import the libraries needed to run the workers in their own processes, and the Board Class and heuristics
+import heapq
+import multiprocessing
+import os
+import queue
+import time
+from itertools import count
+from board import Board
+from heuristics import get_heuristic
+from search_stats import SearchResult, SearchStats
+
+# The multiplier of the hash which assigns each board to a worker (the 64 bit golden ratio), so neighbouring boards
+# are spread evenly over the workers
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_MASK = (1 << 64) - 1
+# The number of nodes a worker expands between sending its batches of nodes to the other workers
+EXPAND_BATCH = 64
+# The number of seconds the main process waits between termination checks while the workers are busy
+PROBE_INTERVAL = 0.01
+# The way the worker processes are started, spawn rather than fork, as the search may be run from a thread of a
+# program with other threads (such as the tkinter window) which is unsafe to fork
+START_METHOD = "spawn"
+# The number of seconds the main process waits for a reply before checking the workers are alive and the budget
+REPLY_TIMEOUT = 0.1
+
+
+class WorkerFailed(RuntimeError):
+    """
+    Define a custom exception 'WorkerFailed' to throw if a worker process stops before the search has finished
+    """
+
+    def __init__(self, message="A worker process stopped before the search finished"):
+        self.message = message
+        super().__init__(self.message)
+
+
+def owner(state, workers):
+    """
+    function to return the worker which owns a board, every node with that board is sent to and searched by it
+    :param state: the packed state of the board
+    :param workers: the number of workers
+    :return: the integer index of the worker
+    """
+    return (((state * HASH_MULTIPLIER) & HASH_MASK) >> 32) % workers
+
+
+def hda_worker(index, workers, goal_board, algo, inboxes, results, incumbent):
+    """
+    hda_worker is the function run by each worker process. The worker keeps the open and closed lists of the boards it
+    owns, expands its best nodes and sends each successor to the worker which owns it, in batches
+    the worker answers the messages on its inbox:
+    * ("nodes", nodes) - a batch of (state, blank, g, h, parent state, moved tile) nodes to add to its open list
+    * ("probe", wave) - reply with whether it has any work and its message counters, for termination detection
+    * ("trace", state) - reply with the parent state and moved tile of one of its boards, to rebuild the path
+    * ("stop",) - stop the worker
+    :param index: the index of this worker
+    :param workers: the number of workers
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: the name of the heuristic algorithm to use
+    :param inboxes: an array of the inbox queue of every worker
+    :param results: the queue to send replies to the main process on
+    :param incumbent: a shared multiprocessing Value holding the cost of the best solution found by any worker
+    :return: None
+    """
+    goal = Board(goal_board)
+    layout = goal.layout
+    heuristic = get_heuristic(algo, goal)
+    inbox = inboxes[index]
+    # the open list is a heap of (f, h, tie, state, blank, g) entries, known maps each board seen by this worker to
+    # the (g, parent state, moved tile) of the cheapest node with it, it holds the open and the closed boards
+    open_list = []
+    known = {}
+    tie = count()
+    # the nodes waiting to be sent to each worker
+    outboxes = [[] for i in range(0, workers)]
+    # the numbers of batches sent and received, and of nodes expanded and generated
+    counters = {"sent": 0, "received": 0, "expanded": 0, "generated": 0}
+
+    def add(state, blank, g, h, parent, move):
+        """
+        add a node to the open list, unless it cannot lead to a cheaper solution or its board is known more cheaply
+        """
+        if g + h >= incumbent.value:
+            return
+        entry = known.get(state)
+        if entry is not None and entry[0] <= g:
+            return
+        known[state] = (g, parent, move)
+        heapq.heappush(open_list, (g + h, h, next(tie), state, blank, g))
+
+    def has_work():
+        """
+        drop the nodes at the top of the open list which were replaced by a cheaper node or cannot beat the best
+        solution, then report whether a node is left to expand
+        """
+        while open_list:
+            entry = open_list[0]
+            if known[entry[3]][0] < entry[5] or entry[0] >= incumbent.value:
+                heapq.heappop(open_list)
+                continue
+            return True
+        return False
+
+    while True:
+        # read the waiting messages, only waiting for a message when there is nothing to expand
+        messages = []
+        try:
+            messages.append(inbox.get(block=not has_work()))
+            while True:
+                messages.append(inbox.get_nowait())
+        except queue.Empty:
+            pass
+
+        for message in messages:
+            if message[0] == "nodes":
+                counters["received"] += 1
+                for node in message[1]:
+                    add(*node)
+            elif message[0] == "probe":
+                work = has_work()
+                results.put(("probe", index, not work, counters["sent"], counters["received"], counters["expanded"],
+                             counters["generated"], open_list[0][0] if work else None, len(open_list), len(known)))
+            elif message[0] == "trace":
+                results.put(("trace",) + known[message[1]][1:])
+            elif message[0] == "stop":
+                return
+
+        # expand a batch of the best nodes
+        for i in range(0, EXPAND_BATCH):
+            if not has_work():
+                break
+            f, h, _, state, blank, g = heapq.heappop(open_list)
+            counters["expanded"] += 1
+            if state == goal.state:
+                # a cheaper solution, every worker prunes the nodes which cannot beat it from now on
+                with incumbent.get_lock():
+                    if g < incumbent.value:
+                        incumbent.value = g
+                continue
+            board = Board.from_state(state, blank, layout)
+            parent = known[state][1]
+            for point in layout.neighbours[blank]:
+                child = board.swap(blank, point)
+                # skip the move back to the parent
+                if child.state == parent:
+                    continue
+                num = board.tile(point)
+                node = (child.state, point, g + 1, heuristic.child_h(h, child, num, point, blank), state, num)
+                counters["generated"] += 1
+                dest = owner(child.state, workers)
+                if dest == index:
+                    add(*node)
+                else:
+                    outboxes[dest].append(node)
+
+        # send the batches of successors to their owners
+        for dest in range(0, workers):
+            if outboxes[dest]:
+                inboxes[dest].put(("nodes", outboxes[dest]))
+                outboxes[dest] = []
+                counters["sent"] += 1
+
+
+def hda_star(start_board, goal_board, algo, budget=None, stats=None, workers=None):
+    """
+    hda_star is a function which uses Hash Distributed A* to find the shortest number of moves from the start to the
+    goal board with several worker processes at once.
+    every board is owned by one worker, chosen by a hash of the board, which keeps the open and closed lists of its
+    boards and sends the successors it generates to their owners in batches. The worker which owns the goal sets the
+    shared cost of the best solution when it expands the goal, and every worker then discards the nodes which cannot
+    beat it. The search has finished when every worker has nothing left to expand and no batch is still on its way,
+    which the main process detects by asking every worker for its counts of batches sent and received, and waiting
+    for two rounds in a row with every worker idle, the same counts, and as many batches received as sent. The
+    solution is then optimal, as with a_star
+    :param start_board: A 2D Array containing values for the start board
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: the name of the heuristic algorithm to use
+    :param budget: a Budget limiting the number of nodes expanded and the time taken, None for no limit. It is checked
+                   between termination checks rather than per node
+    :param stats: a SearchStats to fill in (with any hooks or profiler to run), None to create a new one. the hooks are
+                  called once per termination check with None as the node, and the profiler only covers the main
+                  process
+    :param workers: the number of worker processes, the number of CPUs if None
+    :return: A SearchResult is returned containing the cost, the number of nodes expanded and the individual moves
+             required to get from the start to goal node (empty if the puzzle is unsolvable), and the statistics
+    :raises WorkerFailed: if a worker process stops before the search has finished, the other workers are stopped
+    """
+
+    if stats is None:
+        stats = SearchStats()
+    stats.start()
+    try:
+        # Set the global 'algo' variable of board to the passed in algorithm string
+        Board.algo = algo
+        start = Board(start_board)
+        goal = Board(goal_board)
+        heuristic = get_heuristic(algo, goal)
+
+        # the workers would have to exhaust every reachable board before giving up on an unsolvable puzzle, so check
+        # the parity of the boards first
+        if not start.is_solvable(goal):
+            return SearchResult([], stats)
+
+        workers = workers or os.cpu_count()
+        context = multiprocessing.get_context(START_METHOD)
+        inboxes = [context.Queue() for i in range(0, workers)]
+        results = context.Queue()
+        incumbent = context.Value("d", float("inf"))
+        processes = [context.Process(target=hda_worker, daemon=True,
+                                     args=(i, workers, goal_board, algo, inboxes, results, incumbent))
+                     for i in range(0, workers)]
+        for process in processes:
+            process.start()
+
+        def receive():
+            """
+            wait for the next reply of a worker, checking between waits that every worker is still running and that
+            the search has not run out of its budget (or been cancelled), so a worker which dies cannot hang the search
+            """
+            while True:
+                try:
+                    return results.get(timeout=REPLY_TIMEOUT)
+                except queue.Empty:
+                    pass
+                for i in range(0, workers):
+                    if not processes[i].is_alive():
+                        raise WorkerFailed("HDA* worker " + str(i) + " stopped with exit code " +
+                                           str(processes[i].exitcode))
+                if budget is not None:
+                    budget.charge(stats.expanded)
+
+        try:
+            # send the start node to its owner, the main process counts as having sent one batch
+            inboxes[owner(start.state, workers)].put(("nodes", [(start.state, start.blank, 0, heuristic.evaluate(start),
+                                                                  None, None)]))
+            previous = None
+            wave = 0
+            while True:
+                # ask every worker for its state, and wait for every reply
+                wave += 1
+                for inbox in inboxes:
+                    inbox.put(("probe", wave))
+                replies = [receive() for i in range(0, workers)]
+                idle = all(reply[2] for reply in replies)
+                counts = (1 + sum(reply[3] for reply in replies), sum(reply[4] for reply in replies))
+
+                expanded = sum(reply[5] for reply in replies)
+                open_fs = [reply[7] for reply in replies if reply[7] is not None]
+                stats.expand_batch(expanded - stats.expanded, min(open_fs) if open_fs else stats.best_f,
+                                   sum(reply[8] for reply in replies), sum(reply[9] for reply in replies))
+                stats.generated = sum(reply[6] for reply in replies)
+                # stop the search if it has run out of its budget
+                if budget is not None:
+                    budget.charge(stats.expanded)
+
+                if idle and counts[0] == counts[1] and counts == previous:
+                    break
+                previous = counts if idle and counts[0] == counts[1] else None
+                if previous is None:
+                    time.sleep(PROBE_INTERVAL)
+
+            if incumbent.value == float("inf"):
+                return SearchResult([], stats)
+            # rebuild the path by asking the owner of each board for its parent, back to the start
+            moves = []
+            state = goal.state
+            while state != start.state:
+                inboxes[owner(state, workers)].put(("trace", state))
+                state, move = receive()[1:]
+                moves.append(move)
+            moves.reverse()
+            # prepend the cost (g) and counter of expanded nodes to the moves (for reference in calling code)
+            return SearchResult([int(incumbent.value), stats.expanded] + moves, stats)
+        finally:
+            # a worker which has died (or is terminated) never reads its inbox, so do not wait for the batches sent
+            # to it to be written before exiting
+            for inbox in inboxes:
+                inbox.cancel_join_thread()
+                inbox.put(("stop",))
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+    finally:
+        stats.stop()
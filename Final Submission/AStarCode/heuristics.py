@@ -0,0 +1,360 @@
+# Import the pattern database tables from their file
+from pattern_database import get_databases
+
+# The registry of heuristics, mapping the name of each heuristic algorithm to its Heuristic class, in the order they
+# are offered to the user
+HEURISTICS = {}
+
+
+def register(name):
+    """
+    decorator to add a Heuristic class to the registry under a name
+    :param name: the name of the heuristic algorithm
+    :return: the decorator, which returns the class unchanged
+    """
+    def decorator(cls):
+        HEURISTICS[name] = cls
+        return cls
+    return decorator
+
+
+class Heuristic:
+    """
+    Class to represent a heuristic which is prepared once for a goal board and then evaluated cheaply per node
+    """
+
+    def __init__(self, goal):
+        """
+        the init function stores the goal board, heuristics do their per goal preparation here
+        :param goal: the goal Board of the search
+        """
+        self.goal = goal
+
+    def evaluate(self, board):
+        """
+        function to evaluate the heuristic of a board from scratch, implemented by each heuristic
+        :param board: the Board to evaluate
+        :return: an integer which is the heuristic
+        """
+        raise NotImplementedError
+
+    def child_h(self, parent_h, board, num, src, dst):
+        """
+        function to evaluate the heuristic of a child board, given the heuristic of its parent and the move made
+        heuristics which can update the parent's value cheaply override this, otherwise the child is evaluated
+        :param parent_h: the heuristic of the parent board
+        :param board: the child Board
+        :param num: the value of the tile which was moved
+        :param src: the position the tile was moved from
+        :param dst: the position the tile was moved to
+        :return: an integer which is the heuristic of the child board
+        """
+        return self.evaluate(board)
+
+
+class TileHeuristic(Heuristic):
+    """
+    Class to represent a heuristic where the cost of a board is the sum of a per tile cost, looked up from a table of
+    [tile][position] values, so a move only changes the cost of the one tile that moved
+    """
+
+    def __init__(self, goal):
+        """
+        the init function builds the goal position lookup table and the cost table for the goal board
+        :param goal: the goal Board of the search
+        """
+        super().__init__(goal)
+        size = goal.layout.size
+        cells = goal.layout.cells
+        # look up the (row, col) coordinates of every tile in the goal board, once per search
+        self.goal_pos = [None] * cells
+        for pos in range(0, cells):
+            self.goal_pos[goal.tile(pos)] = divmod(pos, size)
+        # build the table of costs for every tile in every position, the blank tile never has a cost
+        self.table = []
+        for num in range(0, cells):
+            self.table.append([0 if num == 0 else self.cost(num, divmod(pos, size)) for pos in range(0, cells)])
+
+    def cost(self, num, loc):
+        """
+        function to return the cost of a tile in a location, implemented by each heuristic
+        :param num: the value of the tile
+        :param loc: a tuple containing the row and col location of the tile
+        :return: an integer cost of the tile
+        """
+        raise NotImplementedError
+
+    def evaluate(self, board):
+        """
+        function to evaluate the heuristic of a board from scratch
+        :param board: the Board to evaluate
+        :return: an integer which is the heuristic
+        """
+        heuristic = 0
+        for pos in range(0, board.layout.cells):
+            heuristic += self.table[board.tile(pos)][pos]
+        return heuristic
+
+    def child_h(self, parent_h, board, num, src, dst):
+        """
+        function to evaluate the heuristic of a child board from the heuristic of its parent in O(1)
+        :param parent_h: the heuristic of the parent board
+        :param board: the child Board
+        :param num: the value of the tile which was moved
+        :param src: the position the tile was moved from
+        :param dst: the position the tile was moved to
+        :return: an integer which is the heuristic of the child board
+        """
+        # only the moved tile changes its cost, so remove its old cost and add its new cost
+        return parent_h - self.table[num][src] + self.table[num][dst]
+
+
+@register("Manhattan")
+class Manhattan(TileHeuristic):
+    """
+    Class to represent the Manhattan heuristic, the sum of the distances of each tile from its goal location
+    """
+
+    def cost(self, num, loc):
+        """
+        function to return the manhattan distance of a tile in a location from its goal location
+        :param num: the value of the tile
+        :param loc: a tuple containing the row and col location of the tile
+        :return: an integer distance
+        """
+        goal_loc = self.goal_pos[num]
+        return abs(loc[0] - goal_loc[0]) + abs(loc[1] - goal_loc[1])
+
+
+@register("Hamming")
+class Hamming(TileHeuristic):
+    """
+    Class to represent the Hamming heuristic, the number of tiles out of place
+    """
+
+    def cost(self, num, loc):
+        """
+        function to return whether a tile in a location is out of place
+        :param num: the value of the tile
+        :param loc: a tuple containing the row and col location of the tile
+        :return: 1 if the tile is out of place, otherwise 0
+        """
+        return 0 if loc == self.goal_pos[num] else 1
+
+
+@register("Linear Conflict")
+class LinearConflict(Manhattan):
+    """
+    Class to represent the Manhattan + Linear Conflict heuristic
+    two tiles in their goal row (or column) but in the wrong order must pass each other, which takes at least 2 moves
+    more than their manhattan distances. For each row and column, the fewest tiles which have to leave the line to
+    clear every conflict in it is the number of tiles in the line minus the longest run of them already in order
+    """
+
+    def __init__(self, goal):
+        """
+        the init function builds the manhattan tables for the goal board
+        :param goal: the goal Board of the search
+        """
+        super().__init__(goal)
+        self.size = goal.layout.size
+
+    def line_conflicts(self, positions, line, vertical):
+        """
+        function to count the tiles which have to leave a line to clear its linear conflicts
+        :param positions: a function returning the tile at a position, for the board being evaluated
+        :param line: the index of the row or column
+        :param vertical: a Boolean, True for a column, False for a row
+        :return: an integer number of tiles
+        """
+        # collect, in board order, the goal places along the line of the tiles whose goal is in this line
+        places = []
+        for i in range(0, self.size):
+            pos = i * self.size + line if vertical else line * self.size + i
+            num = positions(pos)
+            if num == 0:
+                continue
+            goal_loc = self.goal_pos[num]
+            if vertical and goal_loc[1] == line:
+                places.append(goal_loc[0])
+            elif not vertical and goal_loc[0] == line:
+                places.append(goal_loc[1])
+        # find the length of the longest increasing run of goal places, these tiles can stay in the line
+        longest = [1] * len(places)
+        for i in range(0, len(places)):
+            for j in range(0, i):
+                if places[j] < places[i] and longest[j] + 1 > longest[i]:
+                    longest[i] = longest[j] + 1
+        return len(places) - max(longest, default=0)
+
+    def evaluate(self, board):
+        """
+        function to evaluate the heuristic of a board from scratch
+        :param board: the Board to evaluate
+        :return: an integer which is the heuristic
+        """
+        heuristic = super().evaluate(board)
+        for line in range(0, self.size):
+            heuristic += 2 * (self.line_conflicts(board.tile, line, False) + self.line_conflicts(board.tile, line, True))
+        return heuristic
+
+    def child_h(self, parent_h, board, num, src, dst):
+        """
+        function to evaluate the heuristic of a child board from the heuristic of its parent
+        a vertical move only changes the tiles in the rows it moves between, and a horizontal move only changes the
+        tiles in the columns it moves between, so only those two lines are counted again
+        :param parent_h: the heuristic of the parent board
+        :param board: the child Board
+        :param num: the value of the tile which was moved
+        :param src: the position the tile was moved from
+        :param dst: the position the tile was moved to
+        :return: an integer which is the heuristic of the child board
+        """
+        # the parent board is the child board with the tile moved back
+        parent = board.swap(src, dst)
+        vertical = src % self.size == dst % self.size
+        lines = (src // self.size, dst // self.size) if vertical else (src % self.size, dst % self.size)
+        heuristic = super().child_h(parent_h, board, num, src, dst)
+        for line in lines:
+            # a vertical move changes rows, a horizontal move changes columns
+            heuristic += 2 * (self.line_conflicts(board.tile, line, not vertical)
+                              - self.line_conflicts(parent.tile, line, not vertical))
+        return heuristic
+
+
+@register("Walking Distance")
+class WalkingDistance(Heuristic):
+    """
+    Class to represent the Walking Distance heuristic
+    looking only at rows, a board is summarised by how many tiles in each row belong in each goal row, and a vertical
+    move takes one tile from the row of the blank to a neighbouring row. The fewest moves to sort the tiles into their
+    goal rows this way is found by a breadth first search once per board size, and the same table is used for columns
+    """
+    # Class Variable to cache the tables of distances, one per board size and line of the goal blank
+    tables = {}
+    # the largest board size whose table can be built, the table of a 5x5 board is too large to finish
+    MAX_SIZE = 4
+
+    def __init__(self, goal):
+        """
+        the init function finds the goal row and column of every tile and the tables for the goal board
+        :param goal: the goal Board of the search
+        """
+        super().__init__(goal)
+        self.size = goal.layout.size
+        positions = goal.locate_all()
+        self.goal_row = [pos // self.size for pos in positions]
+        self.goal_col = [pos % self.size for pos in positions]
+        blank_row, blank_col = divmod(goal.blank, self.size)
+        self.row_table = self.get_table(self.size, blank_row)
+        self.col_table = self.get_table(self.size, blank_col)
+
+    @classmethod
+    def get_table(cls, size, blank_line):
+        """
+        function to return the table of walking distances for a board size, building it the first time it is used
+        :param size: the number of rows and columns in the board
+        :param blank_line: the row (or column) of the blank in the goal board
+        :return: a dictionary mapping each summary (counts of tiles per line and goal line, then the line of the
+                 blank) to the number of moves needed to reach the goal summary
+        :raises ValueError: if the board is larger than MAX_SIZE
+        """
+        if (size, blank_line) in cls.tables:
+            return cls.tables[(size, blank_line)]
+        if size > cls.MAX_SIZE:
+            raise ValueError("THE WALKING DISTANCE HEURISTIC ONLY SUPPORTS BOARDS UP TO " + str(cls.MAX_SIZE) + "x" +
+                             str(cls.MAX_SIZE))
+        # in the goal summary every line holds its own tiles, the line of the blank has one fewer
+        counts = [0] * (size * size)
+        for line in range(0, size):
+            counts[line * size + line] = size - 1 if line == blank_line else size
+        start = tuple(counts) + (blank_line,)
+        table = {start: 0}
+        layer = [start]
+        depth = 0
+        # breadth first search over the summaries, moving one tile between the line of the blank and a neighbour
+        while layer:
+            depth += 1
+            next_layer = []
+            for summary in layer:
+                blank = summary[-1]
+                for line in (blank - 1, blank + 1):
+                    if line < 0 or line >= size:
+                        continue
+                    for goal_line in range(0, size):
+                        if summary[line * size + goal_line] == 0:
+                            continue
+                        # a tile belonging in goal_line moves from 'line' to the line of the blank
+                        moved = list(summary)
+                        moved[line * size + goal_line] -= 1
+                        moved[blank * size + goal_line] += 1
+                        moved[-1] = line
+                        moved = tuple(moved)
+                        if moved not in table:
+                            table[moved] = depth
+                            next_layer.append(moved)
+            layer = next_layer
+        cls.tables[(size, blank_line)] = table
+        return table
+
+    def evaluate(self, board):
+        """
+        function to evaluate the heuristic of a board, the vertical walking distance plus the horizontal one
+        :param board: the Board to evaluate
+        :return: an integer which is the heuristic
+        """
+        size = self.size
+        rows = [0] * (size * size)
+        cols = [0] * (size * size)
+        for pos in range(0, board.layout.cells):
+            num = board.tile(pos)
+            if num == 0:
+                continue
+            row, col = divmod(pos, size)
+            rows[row * size + self.goal_row[num]] += 1
+            cols[col * size + self.goal_col[num]] += 1
+        blank_row, blank_col = divmod(board.blank, size)
+        return self.row_table[tuple(rows) + (blank_row,)] + self.col_table[tuple(cols) + (blank_col,)]
+
+
+@register("Pattern Database")
+class PatternDatabaseHeuristic(Heuristic):
+    """
+    Class to represent an additive pattern database heuristic, the sum of the costs of the disjoint patterns of tiles
+    stored in the pattern databases of the goal board
+    """
+
+    def __init__(self, goal):
+        """
+        the init function finds the tables of the goal board, building the small tables if they have not been saved yet
+        (a PatternDatabaseMissing error is raised for a large table which has not been built)
+        :param goal: the goal Board of the search
+        """
+        super().__init__(goal)
+        self.databases = get_databases(goal)
+
+    def evaluate(self, board):
+        """
+        function to evaluate the heuristic of a board by looking up each pattern in its table
+        :param board: the Board to evaluate
+        :return: an integer which is the heuristic
+        """
+        positions = board.locate_all()
+        heuristic = 0
+        for database in self.databases:
+            heuristic += database.lookup(positions, board.layout.cells)
+        return heuristic
+
+
+def get_heuristic(algo, goal):
+    """
+    resolves the heuristic algorithm selected to use into a heuristic prepared for the goal board, this is done once
+    per search rather than once per node
+    :param algo: the name of the heuristic algorithm, one of the keys of HEURISTICS
+    :param goal: the goal Board of the search
+    :return: a Heuristic instance
+    """
+    if algo not in HEURISTICS:
+        # if the name is not in the registry, there is an error
+        raise ValueError("NOT A VALID HEURISTIC ALGORITHM: " + str(algo))
+    return HEURISTICS[algo](goal)
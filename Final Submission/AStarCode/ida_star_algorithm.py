@@ -0,0 +1,86 @@
+# Import the Node and Board Classes from their respective files
+import time
+from node import Node
+from board import Board
+from heuristics import get_heuristic
+from search_stats import SearchResult, SearchStats
+
+
+def ida_star(start_board, goal_board, algo, budget=None, stats=None):
+    """
+    ida_star is a function which takes a start and goal board layout and uses the Iterative Deepening A* algorithm to
+    find the shortest number of moves to reach this goal.
+    IDA* repeats a depth first search, cutting off any node with an f value above a bound, and raises the bound to the
+    smallest f value that was cut off each time, so it only needs memory for the current path
+    :param start_board: A 2D Array containing values for the start board
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: the name of the heuristic algorithm to use
+    :param budget: a Budget limiting the number of nodes expanded and the time taken, None for no limit
+    :param stats: a SearchStats to fill in (with any hooks or profiler to run), None to create a new one
+    :return: A SearchResult is returned containing the cost, the number of nodes expanded and the individual moves
+             required to get from the start to goal node (empty if the puzzle is unsolvable), and the statistics.
+             the frontier size in the statistics is the length of the current path
+    """
+
+    if stats is None:
+        stats = SearchStats()
+    stats.start()
+    try:
+        # Set the global 'algo' variable of board to the passed in algorithm string
+        Board.algo = algo
+        # Create the start and goal boards, and prepare the heuristic for the goal board once for the whole search
+        start = Board(start_board)
+        goal = Board(goal_board)
+        heuristic = stats.timed(get_heuristic(algo, goal))
+
+        # IDA* would never stop on an unsolvable puzzle, so check the parity of the boards first
+        if not start.is_solvable(goal):
+            return SearchResult([], stats)
+
+        # set a counter to count the number of nodes expanded
+        counter = 0
+
+        def search(node, bound):
+            """
+            depth first search below a node, cutting off nodes with an f value above the bound
+            :param node: the Node to search below
+            :param bound: the largest f value to search
+            :return: a tuple of the goal Node (or None if it was not found) and the smallest f value that was cut off
+            """
+            nonlocal counter
+            # if this node is above the bound, cut it off and report its f value
+            if node.f > bound:
+                return None, node.f
+            # check if this node is the goal
+            if node.is_goal(goal):
+                return node, node.f
+            counter += 1
+            # stop the search if it has run out of its budget
+            if budget is not None:
+                budget.charge(counter)
+            stats.expand(node, node.g + 1)
+            # the smallest f value cut off below this node
+            smallest = float("inf")
+            # the successors never move the parent's tile straight back, so the search does not undo its last move
+            st = time.perf_counter()
+            successors = node.get_successors(heuristic)
+            stats.generate_time += time.perf_counter() - st
+            stats.generated += len(successors)
+            for child in successors:
+                found, cut_off = search(child, bound)
+                if found is not None:
+                    return found, cut_off
+                smallest = min(smallest, cut_off)
+            return None, smallest
+
+        # Create the starting node, the first bound is its f value
+        root = Node(start, None, None, 0, heuristic.evaluate(start))
+        bound = root.f
+        while True:
+            found, bound = search(root, bound)
+            if found is not None:
+                # if the goal is found, rebuild the path and prepend the cost (g) and counter of expanded nodes to it
+                # (for reference in calling code)
+                return SearchResult([found.g, counter] + found.get_path(), stats)
+    finally:
+        stats.stop()
@@ -1,39 +1,20 @@
 from functools import partial
 from tkinter import *
 from tkinter import messagebox
-from a_star_algorithm import a_star
-import os
+from solvers import SOLVERS
+from heuristics import HEURISTICS
+from board import check_validity
+from budget import Budget, SearchCancelled, SearchLimitExceeded
+from search_stats import SearchStats
+import queue
+import threading
 
-
-def check_validity(input_board):
-    """
-    check_validity is a function which ensures that the 2D Array representation of the board taken in from the user
-    is of a valid format
-    * There are numbers 0, 1, 2, 3, 4, 5, 6, 7 and 8
-    * There are NO blank spaces
-    * There are NO repeating values
-    :param input_board: 2D Array of board taken in from the user
-    :return: Boolean to notify the calling function whether the board is valid or not
-             * True - Valid Input
-             * False - Invalid Input
-    """
-    # check to see that all required numbers are in the board
-    # iterate over each required number
-    for i in range(0, 9):
-        # set 'found' to false
-        found = False
-        # iterate over each value in the board
-        for row in input_board:
-            for num in row:
-                # if the number in question is found, then set the 'found' flag to true
-                if num == i:
-                    found = True
-        # at the end of the search, if the number in question hasn't been found, then return false
-        if not found:
-            return False
-    # when reaching here, all numbers are present in the code and as a side effect of this check
-    # there would be no duplicates on the board, therefore True can be returned
-    return True
+# The colours of a field, normally and when it holds an invalid value
+ENTRY_BG = '#e6ffff'
+INVALID_BG = '#ff9999'
+# The number of milliseconds between checks for messages from the search, and the number of nodes between messages
+POLL_INTERVAL = 100
+PROGRESS_INTERVAL = 1000
 
 
 class InvalidInputError(Exception):
@@ -48,12 +29,15 @@ class InvalidInputError(Exception):
 
 def populate_board(user_in):
     """
-    populate_board takes the user's input and creates a 2D array of values for the board
+    populate_board takes the user's input and creates a 2D array of values for the board, any field which makes the
+    board invalid is marked in red so the user can correct it
     :param user_in: A tkinter entry type of data in the tables when the submit button was pressed
     :return: A 2D Array of the contents of the input, ready to be turned into a board
     """
     # Create an empty array to store the result
     res = []
+    # note whether every field could be read as a number
+    readable = True
     # Iterate through all elements of the input and add these to 'res'
     for row in range(0, len(user_in)):
         # for each row of the inputted board
@@ -61,61 +45,183 @@ def populate_board(user_in):
         tmp_row = []
         for col in range(0, len(user_in[row])):
             # For each column in the row, append the value to the tmp_row array
-            tmp_row.append(int(user_in[row][col].get()))
+            try:
+                tmp_row.append(int(user_in[row][col].get()))
+                # reset the colour of the field, in case it was marked as invalid by an earlier submit
+                user_in[row][col].config(bg=ENTRY_BG)
+            except ValueError:
+                # mark the field in red and keep a placeholder, so the rest of the fields are still checked
+                user_in[row][col].config(bg=INVALID_BG)
+                tmp_row.append(None)
+                readable = False
         # Append this array of the row into 'res'
         res.append(tmp_row)
+    if not readable:
+        raise InvalidInputError("Every field must hold a whole number")
     # Ensure the board is valid
     if not check_validity(res):
+        # count each value, then mark any value out of range or repeated in red
+        cells = len(res) * len(res)
+        counts = {}
+        for tmp_row in res:
+            for value in tmp_row:
+                counts[value] = counts.get(value, 0) + 1
+        for row in range(0, len(res)):
+            for col in range(0, len(res[row])):
+                value = res[row][col]
+                if not 0 <= value < cells or counts[value] > 1:
+                    user_in[row][col].config(bg=INVALID_BG)
         # If the board is invalid, raise an error
-        raise InvalidInputError
+        raise InvalidInputError("The fields must hold each number from 0 to " + str(cells - 1) + " once")
     # Once here, the board in 'res' would be populated and valid, return 'res'
     return res
 
 
+def solve(solver, start_board, goal_board, algo, cancel, results):
+    """
+    solve is the function run on the worker thread, it runs the search and puts its progress and result onto a queue
+    which is read by the window, as the tkinter window may only be changed from the main thread
+    :param solver: the search function to run, one of the values of SOLVERS
+    :param start_board: A 2D Array containing values for the start board
+    :param goal_board: A 2D Array containing values for the goal board
+    :param algo: the name of the heuristic algorithm to use
+    :param cancel: the threading.Event which is set when the user cancels the search
+    :param results: the queue.Queue to put the messages for the window onto
+    :return: None
+    """
+
+    # the number of nodes expanded when the progress was last reported
+    reported = 0
+
+    def progress(stats, node):
+        """
+        hook called by the search each time it expands a node (or a batch of nodes), reports the progress every few
+        nodes
+        :param stats: the SearchStats of the search
+        :param node: the Node being expanded, None for a batch
+        :return: None
+        """
+        nonlocal reported
+        if stats.expanded - reported >= PROGRESS_INTERVAL:
+            reported = stats.expanded
+            results.put(("progress", stats.expanded, stats.best_f))
+
+    try:
+        res = solver(start_board, goal_board, algo, Budget(cancel=cancel), SearchStats(hooks=[progress]))
+        results.put(("done", res))
+    except SearchCancelled as e:
+        # the user cancelled the search before it finished
+        results.put(("cancelled", e.message))
+    except SearchLimitExceeded as e:
+        # the search gave up before it finished, e.g. a beam search which ran out of nodes to expand
+        results.put(("limit", e.message))
+    except ValueError as e:
+        # the search cannot solve these boards
+        results.put(("error", str(e)))
+    except Exception as e:
+        # any other failure is still reported, so the window never waits for a search which has stopped
+        results.put(("error", type(e).__name__ + ": " + str(e)))
+
+
 def run_process(app):
     """
-    run_process is the function that actually calls the a_star function implemented by myself
+    run_process is the function that reads the boards and starts the selected search function implemented by myself on
+    a worker thread, so the window stays responsive while it runs
     :param app: the Win instance that called the function
     :return: None
     """
     try:
         # get the selected algorithm option from the dropdown box
         algo = app.str_var.get()
+        # get the selected search strategy from the second dropdown box
+        solver = SOLVERS[app.search_var.get()]
         # use the populate_board function to populate the start and goal board
-        start_board = populate_board(start_rows)
-        goal_board = populate_board(goal_rows)
-        # set the status text to inform the user that the problem is being solved
-        app.text_strs[0].set("Status --> Solving ...")
-        # update the window to reflect the change
-        app.window.update()
-        # call the a_star function to run the A* Algorithm on the start and goal state inputted by the user
-        res = a_star(start_board, goal_board, algo)
-        # Set the status to Complete
-        app.text_strs[0].set("Status --> Complete")
-        # Expand thw window so the result can be shown
-        app.window.geometry("740x545")
-        # If the length of 'res' is 0, then the problem is unsolvable
-        if len(res) == 0:
-            msg = "The puzzle provided is NOT solvable"
-        else:
-            # otherwise the problem is solvable, construct a message to show specifics of the solution
-            msg = "Reached goal after " + str(res.pop(0)) + \
-                  " moves, using " + str(res.pop(0)) + " while loops on open_list, moves:"
-
-        # change the live text to the custom message and the result of the A*
-        app.text_strs[1].set(msg)
-        app.text_strs[2].set(res)
-    except (InvalidInputError, ValueError) as e:
-        # If there is an InvalidInputError
-        # Show a messagebox to alert the user
+        start_board = populate_board(app.start_rows)
+        goal_board = populate_board(app.goal_rows)
+    except InvalidInputError as e:
+        # If there is an InvalidInputError, the invalid fields are already marked in red
+        # Show a messagebox to alert the user, and leave the window as it is so the fields can be corrected
+        app.text_strs[0].set("Status --> Invalid Input")
         messagebox.showerror(title=None,
-                             message="InvalidInputError, Please re-enter a valid start and goal board layout")
-        # destroy the current window
-        app.window.destroy()
-        # run a new instance of this python program
-        os.system("python main.py")
-        # exit this python program instance
-        exit()
+                             message="InvalidInputError, " + e.message + ", please correct the fields marked in red")
+        return
+
+    # set the status text to inform the user that the problem is being solved, and clear any previous result
+    app.text_strs[0].set("Status --> Solving ...")
+    app.text_strs[1].set("")
+    app.text_strs[2].set("")
+    # only one search runs at a time, and only a running search can be cancelled
+    app.submitter.config(state=DISABLED)
+    app.cancel_button.config(state=NORMAL)
+    # give each search its own event and queue, so nothing is left over from an earlier search
+    app.cancel = threading.Event()
+    app.results = queue.Queue()
+    worker = threading.Thread(target=solve, args=(solver, start_board, goal_board, algo, app.cancel, app.results),
+                              daemon=True)
+    worker.start()
+    # check the queue for messages from the worker thread
+    app.window.after(POLL_INTERVAL, poll_results, app)
+
+
+def poll_results(app):
+    """
+    poll_results reads the messages the worker thread has put onto the queue, it is called every POLL_INTERVAL
+    milliseconds by the window until the search finishes
+    :param app: the Win instance running the search
+    :return: None
+    """
+    try:
+        while True:
+            message = app.results.get_nowait()
+            if message[0] == "progress":
+                # show the number of nodes expanded and the f value of the latest node expanded
+                app.text_strs[0].set("Status --> Solving ... " + str(message[1]) + " expanded, f = " + str(message[2]))
+            else:
+                show_result(app, message)
+                return
+    except queue.Empty:
+        pass
+    app.window.after(POLL_INTERVAL, poll_results, app)
+
+
+def show_result(app, message):
+    """
+    show_result shows the outcome of a search in the window and allows another search to be started
+    :param app: the Win instance that ran the search
+    :param message: the final message of the worker thread, a tuple of "done" and the result of the search, or of
+                    "cancelled", "limit" or "error" and a reason
+    :return: None
+    """
+    app.submitter.config(state=NORMAL)
+    app.cancel_button.config(state=DISABLED)
+    if message[0] == "cancelled":
+        app.text_strs[0].set("Status --> Cancelled")
+        return
+    if message[0] == "limit":
+        app.text_strs[0].set("Status --> Stopped Early")
+        app.text_strs[1].set(message[1])
+        return
+    if message[0] == "error":
+        app.text_strs[0].set("Status --> Error")
+        app.text_strs[1].set(message[1])
+        return
+
+    res = message[1]
+    # Set the status to Complete
+    app.text_strs[0].set("Status --> Complete")
+    # Expand thw window so the result can be shown
+    app.window.geometry("740x600")
+    # If the length of 'res' is 0, then the problem is unsolvable
+    if len(res) == 0:
+        msg = "The puzzle provided is NOT solvable"
+    else:
+        # otherwise the problem is solvable, construct a message to show specifics of the solution
+        msg = "Reached goal after " + str(res.pop(0)) + \
+              " moves, using " + str(res.pop(0)) + " while loops on open_list, moves:"
+
+    # change the live text to the custom message and the result of the A*
+    app.text_strs[1].set(msg)
+    app.text_strs[2].set(res)
 
 
 class Win():
@@ -141,7 +247,7 @@ class Win():
                 # position this frame in the correct position relative to the functions start_row
                 frame.grid(row=i, column=j)
                 # Create an Entry Field inside this frame and set up options
-                e = Entry(master=frame, width=10, font=("Comic Sans MS", 30), justify=CENTER, bg='#e6ffff', relief=FLAT)
+                e = Entry(master=frame, width=10, font=("Comic Sans MS", 30), justify=CENTER, bg=ENTRY_BG, relief=FLAT)
                 # Append this entry to the cols array
                 cols.append(e)
                 # pack the entity i.e. send it off to be displayed
@@ -156,10 +262,17 @@ class Win():
         :param goal_rows: array to store the rows of the goal board to
         """
 
+        # store the arrays of the rows, to read the boards from when the submit button is pressed
+        self.start_rows = start_rows
+        self.goal_rows = goal_rows
+        # the event to cancel the running search and the queue of its messages, created when a search starts
+        self.cancel = None
+        self.results = None
+
         # Instantiate self.window as a Tk() instance
         self.window = Tk()
         # Set the dimentions of the window
-        self.window.geometry("740x485")
+        self.window.geometry("740x540")
         # set the background color of the window
         self.window.configure(bg='#99d6ff')
         # set the title of the window
@@ -174,8 +287,8 @@ class Win():
         self.heading.grid(row=0, column=0, columnspan=3, sticky='w')
 
         # Set up the option field for the heuristics
-        # Define an array of options
-        heuristicOption = ["Manhattan", "Hamming"]
+        # Define an array of options, one for each heuristic in the registry
+        heuristicOption = list(HEURISTICS)
         # Create a StringVar object for this
         self.str_var = StringVar(self.window)
         # set the initial value to Manhattan, as its more effective
@@ -193,7 +306,16 @@ class Win():
                               font=("Comic Sans MS", 15),
                               bg='#99d6ff')
         # Place this heading in the correct position in the window
-        self.heading1.grid(row=5, column=0, columnspan=3)
+        self.heading1.grid(row=5, column=0, columnspan=2, sticky='w')
+
+        # Set up the option field for the search strategy, in the same way as the heuristic options
+        searchOption = list(SOLVERS)
+        self.search_var = StringVar(self.window)
+        # set the initial value to A*
+        self.search_var.set(searchOption[0])
+        self.search_options = OptionMenu(self.window, self.search_var, *searchOption)
+        self.search_options.config(font=("Comic Sans MS", 10), bg='#ffff99', activebackground='#ffff99')
+        self.search_options.grid(row=5, column=2, sticky="e")
 
         # Generate the 2 Input Grids using the gui_gen function
         self.gui_gen(start_rows, 1)
@@ -201,7 +323,7 @@ class Win():
 
         # Create the exit button using the Button object
         self.exit_button = Button(self.window,
-                                  text="Exit", command=self.window.destroy,
+                                  text="Exit", command=self.close,
                                   height=2,
                                   width=30,
                                   bg='#ff4d4d',
@@ -220,6 +342,18 @@ class Win():
         # Place this button in the correct place in the window
         self.submitter.grid(row=10, column=1)
 
+        # Create the Cancel Button, which is only enabled while a search is running
+        self.cancel_button = Button(self.window,
+                                    text="Cancel",
+                                    command=self.cancel_search,
+                                    state=DISABLED,
+                                    height=2,
+                                    width=30,
+                                    bg='#ffcc80',
+                                    activebackground='#ffcc80')
+        # Place this button below the submit button
+        self.cancel_button.grid(row=11, column=1)
+
         # Create 2 arrays to hold the StringVar and Strings for dynamic text fields
         self.text_elems = []
         self.text_strs = []
@@ -237,8 +371,28 @@ class Win():
         self.text_strs[0].set("Status --> Awaiting Input")
         # Position each of the 3 Labels in the correct positions in the window
         self.text_elems[0].grid(row=10, column=2, sticky='e')
-        self.text_elems[1].grid(row=11, column=0, columnspan=3, sticky='w')
-        self.text_elems[2].grid(row=12, column=0, columnspan=3, sticky='w')
+        self.text_elems[1].grid(row=12, column=0, columnspan=3, sticky='w')
+        self.text_elems[2].grid(row=13, column=0, columnspan=3, sticky='w')
+        # stop any running search if the window is closed
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+    def cancel_search(self):
+        """
+        set the cancel event of the running search, the search stops the next time it expands a node
+        :return: None
+        """
+        if self.cancel is not None:
+            self.cancel.set()
+            self.text_strs[0].set("Status --> Cancelling ...")
+
+    def close(self):
+        """
+        cancel any running search and close the window
+        :return: None
+        """
+        if self.cancel is not None:
+            self.cancel.set()
+        self.window.destroy()
 
     def run(self):
         """
@@ -247,10 +401,11 @@ class Win():
         """
         self.window.mainloop()
 
-# Declare 2 Variables
-start_rows = []
-goal_rows = []
-# Create the win object to run the program
-app = Win(start_rows, goal_rows)
-# Run the app
-app.run()
\ No newline at end of file
+if __name__ == "__main__":
+    # Declare 2 Variables
+    start_rows = []
+    goal_rows = []
+    # Create the win object to run the program
+    app = Win(start_rows, goal_rows)
+    # Run the app
+    app.run()
@@ -1,36 +1,28 @@
-# Import the deepcopy function from the copy library
-from copy import deepcopy
-
 class Node:
     """
-    Class to represent a node in the 8-Puzzle Game
+    Class to represent a node in the N-Puzzle Game
+    a node only stores the node it was reached from and the tile moved to reach it, the path is rebuilt from these
     """
+    # Fix the attributes of a node, so each instance does not need a dictionary
+    __slots__ = ("board", "parent", "move", "g", "h", "f")
 
-    def __init__(self, board, goal, g, path, initial=False):
+    def __init__(self, board, parent, move, g, h):
         """
-        the init function initialises the Node object and generates h, g, and f values
-        :param board: The Board to represent the current layout of the 8-Puzzle
-        :param goal: The Board to represent the Goal State of the puzzle
-        :param g: The cost of the node that this Node is the child of
-        :param path: The Path used to reach this node
-        :param initial: A Boolean to specify this is the root node, if so, a different instantiation approach is taken
+        the init function initialises the Node object and generates the f value
+        :param board: The Board to represent the current layout of the N-Puzzle
+        :param parent: The Node this node was reached from, None for the root node
+        :param move: The tile moved to reach this node from its parent, None for the root node
+        :param g: The cost from the start node to this node
+        :param h: The heuristic of the board of this node
         """
         # Instantiate Attributes using passed in variables
         self.board = board
-        self.goal = goal
-        self.path = deepcopy(path)
-        # If this node is the root node, then the h, g and f values would be set to 0
-        if initial:
-            self.g = self.h = self.f = 0
-        # If the node is not a root node, then set calculate the h, g and f values as below
-        else:
-            # The g value would be the g value passed in, incremented
-            # g is the cost from the start node to the current node
-            self.g = g + 1
-            # the h value would be generated using the get_heuristic method of the board object
-            self.h = self.board.get_heuristic(goal)
-            # the f value would be the sum of the g and h values
-            self.f = self.g + self.h
+        self.parent = parent
+        self.move = move
+        self.g = g
+        self.h = h
+        # the f value would be the sum of the g and h values
+        self.f = self.g + self.h
 
     def __eq__(self, other):
         """
@@ -40,42 +32,60 @@ class Node:
         """
         return self.board == other.board
 
-    def is_goal(self):
+    def __hash__(self):
+        """
+        overriding the 'hash' function to hash Nodes via the 'board' attribute only, consistent with 'eq'
+        :return: an integer hash of the board of this node
+        """
+        return hash(self.board)
+
+    def is_goal(self, goal):
         """
         method to check if the Node is equal to the goal
+        :param goal: The Board to represent the Goal State of the puzzle
         :return: A Boolean of whether the board of this node is equal to the goal board
         """
-        return self.board == self.goal
+        return self.board == goal
+
+    def get_path(self):
+        """
+        method to rebuild the path used to reach this node, by following the parent of each node back to the root
+        :return: an array of the tiles moved, in order, to get from the start node to this node
+        """
+        moves = []
+        node = self
+        # walk back to the root node, collecting the tile moved to reach each node
+        while node.parent is not None:
+            moves.append(node.move)
+            node = node.parent
+        # the moves were collected from this node backwards, so reverse them
+        moves.reverse()
+        return moves
 
-    def get_successors(self):
+    def get_successors(self, heuristic):
         """
         method to generate all the valid successors of the current node
+        :param heuristic: the Heuristic of the search, used to generate the h value of each successor from this node's
         :return: an array of Nodes which are the successors of the current node
         """
-        # create two empty lists, 'res' and 'points'
+        # create an empty list, 'res'
         res = []
-        points = []
-        # locate the blank tile in the board using the Boards locate method
-        blank = self.board.locate(0)
-        # Consider 4 possible moves for the blank tiles and if the move is possible and valid, then append the new point
-        # to the points list
-        if blank[0] > 0:
-            points.append((blank[0] - 1, blank[1]))
-        if blank[0] < 2:
-            points.append((blank[0] + 1, blank[1]))
-        if blank[1] > 0:
-            points.append((blank[0], blank[1] - 1))
-        if blank[1] < 2:
-            points.append((blank[0], blank[1] + 1))
+        # the blank tile position is cached in the board
+        blank = self.board.blank
 
-        # Iterate through all the points
-        for point in points:
-            # create a deepcopy of the current board
-            new_path = deepcopy(self.path)
-            # swap the tile and the point from the points list in this copied board
-            new_path.append((0, self.board.brd[point[0]][point[1]]))
-            # use this board and attributes of the current board to instantiate a new Node
-            # append this new Node to the res list
-            res.append(Node(self.board.swap(blank, point), self.goal, self.g, new_path))
+        # Iterate through all the positions the blank tile can move to, from the precomputed move table of the board
+        for point in self.board.layout.neighbours[blank]:
+            num = self.board.tile(point)
+            # skip the move which is the inverse of the parent's move, moving the same tile back would return to the
+            # parent
+            if num == self.move:
+                continue
+            # swap the blank and the tile at the point, the tile moves from the point to the blank position
+            board = self.board.swap(blank, point)
+            # the h value is the h value of this node, updated for the one tile that moved
+            h = heuristic.child_h(self.h, board, num, point, blank)
+            # use this board to instantiate a new Node one move further from the start, with this node as its parent
+            # and the moved tile as its move, append this new Node to the res list
+            res.append(Node(board, self, num, self.g + 1, h))
         # return 'res' the array of successor nodes
         return res
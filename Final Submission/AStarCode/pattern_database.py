@@ -0,0 +1,292 @@
+# Import the libraries needed to store and memory-map the tables, and the Board Class
+import argparse
+import json
+import mmap
+import os
+from board import Board
+
+# The directory the pattern databases are saved to and loaded from
+PDB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pattern_databases")
+# The first line of every pattern database file
+MAGIC = b"PDB1\n"
+# The value stored for a pattern which has not been reached
+UNSEEN = 255
+# The largest table (in entries) which is built when a search first needs it, which takes well under a second. Larger
+# tables take minutes to build, so they must be built beforehand with the command line of this file
+AUTO_BUILD_ENTRIES = 20000
+
+# The default disjoint partitions of the tiles for each board size, the tables of a partition can be added together
+# (the 4x4 tables take about 25 minutes to build, a 5x5 partition would need tables too large to build in Python)
+PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+}
+
+
+class PatternDatabaseMissing(ValueError):
+    """
+    Define a custom exception 'PatternDatabaseMissing' to throw if a search needs a table which is too large to build
+    during the search and has not been built beforehand
+    """
+
+    def __init__(self, path, size):
+        self.message = ("THE PATTERN DATABASE " + os.path.basename(path) + " HAS NOT BEEN BUILT, build it first with: "
+                        "python pattern_database.py " + str(size))
+        super().__init__(self.message)
+
+
+def rank(positions, cells):
+    """
+    function to generate the perfect hash index of the positions of the tiles of a pattern
+    the positions are numbered as a partial permutation, so every placement of the tiles has a unique index between 0
+    and cells! / (cells - k)! - 1
+    :param positions: a sequence of the positions of the k tiles of the pattern, in pattern order
+    :param cells: the number of positions on the board
+    :return: the integer index
+    """
+    index = 0
+    for i in range(0, len(positions)):
+        # the position is numbered among the positions not already taken by earlier tiles of the pattern
+        smaller = 0
+        for j in range(0, i):
+            if positions[j] < positions[i]:
+                smaller += 1
+        index = index * (cells - i) + positions[i] - smaller
+    return index
+
+
+def table_size(k, cells):
+    """
+    function to return the number of entries in the table of a pattern with k tiles
+    :param k: the number of tiles in the pattern
+    :param cells: the number of positions on the board
+    :return: the integer number of entries, cells! / (cells - k)!
+    """
+    res = 1
+    for i in range(0, k):
+        res *= cells - i
+    return res
+
+
+class PatternDatabase:
+    """
+    Class to represent the table of one pattern of an additive pattern database
+    the table holds, for every placement of the tiles of the pattern, the smallest number of moves of those tiles
+    needed to bring them to their goal positions. Only moves of pattern tiles are counted, so the tables of disjoint
+    patterns can be added together
+    """
+    # Class Variable to cache the loaded tables of this process, so each file is only mapped once
+    databases = {}
+
+    def __init__(self, goal, tiles, path):
+        """
+        the init function stores the details of the pattern, the table itself is only mapped when it is first used
+        :param goal: the goal Board of the pattern
+        :param tiles: a tuple of the tiles in the pattern
+        :param path: the path of the file holding the table
+        """
+        self.goal = goal
+        self.tiles = tuple(tiles)
+        self.path = path
+        self.offset = 0
+        self.mapped = None
+
+    @staticmethod
+    def get_path(goal, tiles):
+        """
+        function to generate the file name of the table of a pattern for a goal board
+        :param goal: the goal Board of the pattern
+        :param tiles: a tuple of the tiles in the pattern
+        :return: the path of the file
+        """
+        name = "pdb_%d_%x_%s.bin" % (goal.layout.size, goal.state, "-".join(str(num) for num in tiles))
+        return os.path.join(PDB_DIR, name)
+
+    @classmethod
+    def get(cls, goal, tiles, build=False):
+        """
+        function to return the table of a pattern for a goal board. If there is no file for it, a small table is built
+        (see AUTO_BUILD_ENTRIES) and saved, a larger one is only built if 'build' is True
+        :param goal: the goal Board of the pattern
+        :param tiles: a tuple of the tiles in the pattern
+        :param build: True to build and save the table whatever its size, as the command line does
+        :return: the PatternDatabase instance
+        """
+        path = cls.get_path(goal, tiles)
+        if path not in cls.databases:
+            database = PatternDatabase(goal, tiles, path)
+            if not os.path.exists(path):
+                if not build and table_size(len(tiles), goal.layout.cells) > AUTO_BUILD_ENTRIES:
+                    raise PatternDatabaseMissing(path, goal.layout.size)
+                table = database.build()
+                # a small table is only saved by the process which takes the lock on its file, any other process
+                # building it at the same time just uses its own copy
+                if build or database.lock():
+                    database.save(table)
+                database.mapped = table
+            cls.databases[path] = database
+        return cls.databases[path]
+
+    def build(self):
+        """
+        function to build the table with a retrograde breadth first search from the goal placement of the pattern
+        the blank can move freely between the positions which do not hold a pattern tile, so the search state is the
+        placement of the pattern tiles and the region of the board the blank can reach without moving one of them
+        :return: a bytearray table, indexed by the rank of the placement of the pattern tiles
+        """
+        layout = self.goal.layout
+        cells = layout.cells
+        neighbours = layout.neighbours
+        table = bytearray([UNSEEN]) * table_size(len(self.tiles), cells)
+        # the searched states, indexed by the rank of the placement and the lowest position of the blank region
+        seen = bytearray(len(table) * cells)
+
+        def region(blank, occupied):
+            """
+            flood fill the positions the blank can reach without moving a pattern tile
+            :param blank: the position of the blank
+            :param occupied: a bitmask of the positions holding pattern tiles
+            :return: a bitmask of the positions in the region
+            """
+            reached = 1 << blank
+            stack = [blank]
+            while stack:
+                for point in neighbours[stack.pop()]:
+                    if not (reached | occupied) >> point & 1:
+                        reached |= 1 << point
+                        stack.append(point)
+            return reached
+
+        # the goal placement has no cost
+        start = tuple(self.goal.locate_all()[num] for num in self.tiles)
+        occupied = sum(1 << pos for pos in start)
+        index = rank(start, cells)
+        table[index] = 0
+        reached = region(self.goal.blank, occupied)
+        seen[index * cells + (reached & -reached).bit_length() - 1] = 1
+        layer = [(start, self.goal.blank)]
+        depth = 0
+        # search one layer (number of pattern tile moves) at a time until no new states are found
+        while layer:
+            depth += 1
+            next_layer = []
+            for positions, blank in layer:
+                occupied = 0
+                for pos in positions:
+                    occupied |= 1 << pos
+                reached = region(blank, occupied)
+                # for each pattern tile next to the region, move the tile into the region
+                for i in range(0, len(positions)):
+                    pos = positions[i]
+                    for point in neighbours[pos]:
+                        if not reached >> point & 1:
+                            continue
+                        moved = positions[:i] + (point,) + positions[i + 1:]
+                        index = rank(moved, cells)
+                        # the tile leaves its old position, which becomes part of the new region of the blank
+                        new_region = region(pos, occupied ^ (1 << pos) ^ (1 << point))
+                        key = index * cells + (new_region & -new_region).bit_length() - 1
+                        if seen[key]:
+                            continue
+                        seen[key] = 1
+                        # the first time a placement is reached is with the fewest pattern tile moves
+                        if table[index] == UNSEEN:
+                            table[index] = depth
+                        next_layer.append((moved, pos))
+            layer = next_layer
+        return table
+
+    def lock(self):
+        """
+        function to take the lock on the file of the pattern, by creating a lock file which only one process can create
+        the lock is released by save
+        :return: True if this process holds the lock, False if another process does
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            os.close(os.open(self.path + ".lock", os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            return False
+
+    def save(self, table):
+        """
+        function to save a table to the file of the pattern, as a header followed by one byte per entry, and release
+        the lock on the file if this process holds it
+        :param table: the bytearray table to save
+        :return: None
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        header = {"size": self.goal.layout.size, "goal": self.goal.state, "tiles": list(self.tiles)}
+        # write to a temporary file and rename it, so other processes never map a half written table
+        tmp = self.path + ".%d.tmp" % os.getpid()
+        try:
+            with open(tmp, "wb") as f:
+                f.write(MAGIC)
+                f.write(json.dumps(header).encode() + b"\n")
+                f.write(table)
+            os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(self.path + ".lock"):
+                os.remove(self.path + ".lock")
+
+    def load(self):
+        """
+        function to memory-map the file of the pattern, the pages are shared by every process which maps the file
+        :return: None
+        """
+        with open(self.path, "rb") as f:
+            self.mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mapped[:len(MAGIC)] != MAGIC:
+            raise ValueError("NOT A PATTERN DATABASE FILE: " + self.path)
+        # the table starts after the header line
+        self.offset = self.mapped.find(b"\n", len(MAGIC)) + 1
+
+    def lookup(self, positions, cells):
+        """
+        function to look up the cost of a placement of the pattern tiles
+        :param positions: an array of the positions of every tile, indexed by tile
+        :param cells: the number of positions on the board
+        :return: the integer number of moves of pattern tiles needed to reach the goal placement
+        """
+        # a table built by this process is used as it is, a saved table is mapped the first time it is used
+        if self.mapped is None:
+            self.load()
+        return self.mapped[self.offset + rank([positions[num] for num in self.tiles], cells)]
+
+
+def get_databases(goal, partition=None, build=False):
+    """
+    function to return the tables of an additive pattern database for a goal board
+    :param goal: the goal Board
+    :param partition: a tuple of disjoint tuples of tiles, the default partition for the board size if not given
+    :param build: True to build and save every table which has not been saved, whatever its size
+    :return: an array of PatternDatabase instances
+    """
+    if partition is None:
+        if goal.layout.size not in PARTITIONS:
+            raise ValueError("THERE IS NO PATTERN DATABASE FOR A " + str(goal.layout.size) + "x" +
+                             str(goal.layout.size) + " BOARD")
+        partition = PARTITIONS[goal.layout.size]
+    return [PatternDatabase.get(goal, tiles, build) for tiles in partition]
+
+
+def main():
+    """
+    builds and saves the default pattern databases for a board size, so they do not need to be built at solve time
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Build the additive pattern databases for the N-Puzzle")
+    parser.add_argument("size", type=int, choices=sorted(PARTITIONS), help="the number of rows and columns")
+    parser.add_argument("--goal", type=int, nargs="+",
+                        help="the goal board read row by row, defaults to 1, 2, ... with the blank (0) last")
+    args = parser.parse_args()
+    cells = args.size * args.size
+    tiles = args.goal if args.goal else list(range(1, cells)) + [0]
+    goal = Board([tiles[row * args.size:(row + 1) * args.size] for row in range(0, args.size)])
+    for database in get_databases(goal, build=True):
+        print("Built " + database.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# Import the time library to measure the parts of a search
+import time
+
+
+class SearchResult(list):
+    """
+    Class to represent the result of a search, the usual [cost, counter, *moves] array (empty if the puzzle is
+    unsolvable) which also carries the statistics of the search in its 'stats' attribute
+    """
+
+    def __init__(self, values, stats):
+        """
+        the init function fills the array and attaches the statistics
+        :param values: the [cost, counter, *moves] array, or an empty array
+        :param stats: the SearchStats of the search
+        """
+        super().__init__(values)
+        self.stats = stats
+
+
+class SearchStats:
+    """
+    Class to represent the statistics of one search, filled in by the search as it runs
+    hooks are functions called as hook(stats, node) each time a node is expanded, and a profiler (for example a
+    cProfile.Profile) is enabled for the duration of the search
+    """
+
+    def __init__(self, hooks=None, profiler=None, profile=False):
+        """
+        the init function sets every count and time to 0
+        :param hooks: an array of functions to call each time a node is expanded, None for no hooks
+        :param profiler: an object with enable and disable methods to run during the search, None for no profiler
+        :param profile: True to time every evaluation of the heuristic (heuristic_time), which slows the search down,
+                        so it is off unless asked for
+        """
+        self.hooks = list(hooks) if hooks else []
+        self.profiler = profiler
+        self.profile = profile
+        # the number of nodes expanded and generated
+        self.expanded = 0
+        self.generated = 0
+        # the number of successors discarded as a node with the same board was in the open or closed list
+        self.duplicates_open = 0
+        self.duplicates_closed = 0
+        # the largest sizes the open and closed lists reached
+        self.peak_frontier = 0
+        self.peak_closed = 0
+        # the time spent generating successors (including evaluating them) and in the heuristic only, in seconds, the
+        # heuristic is only timed when profiling, otherwise its time is part of the successor time
+        self.generate_time = 0.0
+        self.heuristic_time = 0.0
+        # the smallest f value of the nodes expanded most recently, and the total time of the search
+        self.best_f = None
+        # the largest ratio the cost of the solution found can be to the optimal cost, 1 for an optimal search
+        self.bound = 1
+        self.wall_time = 0.0
+        self.st = None
+
+    @property
+    def successor_time(self):
+        """
+        the time spent generating successors, not counting the heuristic
+        :return: a float number of seconds
+        """
+        return self.generate_time - self.heuristic_time
+
+    def start(self):
+        """
+        function called by a search when it starts
+        :return: None
+        """
+        self.st = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def stop(self):
+        """
+        function called by a search when it stops, whether or not it found a solution, a search which runs in steps
+        starts and stops for each step, so the wall time is the total of its steps
+        :return: None
+        """
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.wall_time += time.perf_counter() - self.st
+
+    def expand(self, node, frontier_size=0, closed_size=0):
+        """
+        function called by a search each time it expands a node
+        :param node: the Node being expanded
+        :param frontier_size: the number of nodes in the open list
+        :param closed_size: the number of boards in the closed list
+        :return: None
+        """
+        self.expanded += 1
+        self.best_f = node.f
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if closed_size > self.peak_closed:
+            self.peak_closed = closed_size
+        for hook in self.hooks:
+            hook(self, node)
+
+    def expand_batch(self, count, best_f, frontier_size=0, closed_size=0):
+        """
+        function called by a batched search each time it expands a batch of boards at once, the hooks are called once
+        for the batch with None as the node
+        :param count: the number of boards in the batch
+        :param best_f: the smallest f value of the boards in the batch
+        :param frontier_size: the number of boards in the open list
+        :param closed_size: the number of boards seen
+        :return: None
+        """
+        self.expanded += count
+        self.best_f = best_f
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if closed_size > self.peak_closed:
+            self.peak_closed = closed_size
+        for hook in self.hooks:
+            hook(self, None)
+
+    def timed(self, heuristic):
+        """
+        function to wrap a heuristic so the time spent evaluating it is added to 'heuristic_time', when profiling
+        :param heuristic: the Heuristic of the search
+        :return: a TimedHeuristic instance if profiling, else the heuristic itself
+        """
+        if not self.profile:
+            return heuristic
+        return TimedHeuristic(heuristic, self)
+
+    def as_dict(self):
+        """
+        function to return the statistics as a dictionary, for output as JSON
+        :return: a dictionary of the counts and times
+        """
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "duplicates_open": self.duplicates_open,
+            "duplicates_closed": self.duplicates_closed,
+            "peak_frontier": self.peak_frontier,
+            "peak_closed": self.peak_closed,
+            "heuristic_time": self.heuristic_time,
+            "successor_time": self.successor_time,
+            "wall_time": self.wall_time,
+            "bound": self.bound,
+        }
+
+
+class TimedHeuristic:
+    """
+    Class to represent a heuristic which adds the time spent evaluating it to the statistics of a search
+    """
+
+    def __init__(self, heuristic, stats):
+        """
+        the init function stores the heuristic to time and the statistics to add the time to
+        :param heuristic: the Heuristic to wrap
+        :param stats: the SearchStats of the search
+        """
+        self.heuristic = heuristic
+        self.stats = stats
+
+    def evaluate(self, board):
+        """
+        function to evaluate the wrapped heuristic of a board from scratch
+        :param board: the Board to evaluate
+        :return: an integer which is the heuristic
+        """
+        st = time.perf_counter()
+        res = self.heuristic.evaluate(board)
+        self.stats.heuristic_time += time.perf_counter() - st
+        return res
+
+    def child_h(self, parent_h, board, num, src, dst):
+        """
+        function to evaluate the wrapped heuristic of a child board from the heuristic of its parent
+        :param parent_h: the heuristic of the parent board
+        :param board: the child Board
+        :param num: the value of the tile which was moved
+        :param src: the position the tile was moved from
+        :param dst: the position the tile was moved to
+        :return: an integer which is the heuristic of the child board
+        """
+        st = time.perf_counter()
+        res = self.heuristic.child_h(parent_h, board, num, src, dst)
+        self.stats.heuristic_time += time.perf_counter() - st
+        return res
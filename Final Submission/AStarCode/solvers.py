@@ -0,0 +1,25 @@
+# Import every search strategy from its file
+from a_star_algorithm import a_star, weighted_a_star
+from ara_star_algorithm import ara_star
+from batched_search import batched_best_first, beam_search
+from bidirectional_a_star import bidirectional_a_star
+from distance_table import distance_table_solve
+from external_bfs import external_bfs
+from hda_star import hda_star
+from ida_star_algorithm import ida_star
+
+# The search strategies which can be selected, mapping the name shown to the user to the function which runs it
+# every function takes the start board, goal board, heuristic name, an optional Budget and an optional SearchStats, and
+# returns a SearchResult, the array [cost, counter, *moves] with the statistics of the search attached
+SOLVERS = {
+    "A*": a_star,
+    "Weighted A*": weighted_a_star,
+    "ARA*": ara_star,
+    "IDA*": ida_star,
+    "Bidirectional A*": bidirectional_a_star,
+    "HDA*": hda_star,
+    "Distance Table": distance_table_solve,
+    "Batched Best-First": batched_best_first,
+    "Beam Search": beam_search,
+    "External BFS": external_bfs,
+}
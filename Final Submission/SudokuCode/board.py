@@ -16,8 +16,15 @@ class Board:
         :param vals:
         """
         # print("CREATE BOARD")
-        self.brd = vals
+        # copy the rows, as the board is changed in place (see set_cell) and its counts must only describe this board
+        self.brd = [row[:] for row in vals]
         self.fitness = 0
+        # the number of times each value (0 to 9) is in each row, col and box, and the number of distinct values
+        # summed over all of them, kept up to date as cells change so the fitness never needs recalculating
+        self.row_counts = []
+        self.col_counts = []
+        self.box_counts = []
+        self.distinct = 0
         self.set_fitness()
 
     def __str__(self):
@@ -141,46 +148,67 @@ class Board:
 
     def set_fitness(self):
         """
-        calculates the fitness of the board and sets the self.fitness attribute to this value
+        counts the values in every row, col and box of the board and sets the self.fitness attribute from these counts
         :return: None
         """
         # print("SET FITNESS")
-        row_fitness = 0
-        col_fitness = 0
-        box_fitness = 0
-
-        # LOOK AT EACH ROW
-        # STORE EACH ELEMENT IN A SET
-        for row in self.brd:
-            tmp_set = set()
-            for num in row:
-                tmp_set.add(num)
-            row_fitness += len(tmp_set)
-
-        for col in range(0, len(self.brd)):
-            tmp_set = set()
-            for row in self.brd:
-                tmp_set.add(row[col])
-            col_fitness += len(tmp_set)
+        self.row_counts = [[0] * 10 for i in range(0, 9)]
+        self.col_counts = [[0] * 10 for i in range(0, 9)]
+        self.box_counts = [[0] * 10 for i in range(0, 9)]
+        self.distinct = 0
+        for row in range(0, len(self.brd)):
+            for col in range(0, len(self.brd[row])):
+                self.count(row, col, self.brd[row][col], 1)
+        self.update_fitness()
+
+    def update_fitness(self):
+        """
+        sets the self.fitness attribute from the number of distinct values in the rows, cols and boxes
+        :return: None
+        """
+        self.fitness = ((self.distinct / 3) / 81) * 100
 
-        boxes = self.get_all_boxes()
-        for box in boxes:
-            tmp_set = set()
-            for num in box:
-                tmp_set.add(num)
-            box_fitness += len(tmp_set)
+    def count(self, row, col, val, change):
+        """
+        adds to the counts of a value in the row, col and box of a cell, and keeps the number of distinct values up to
+        date as counts go to or from zero
+        :param row: integer row the tile is in
+        :param col: integer column the tile is in
+        :param val: the value whose counts change
+        :param change: 1 to add the value, -1 to remove it
+        :return: None
+        """
+        for counts in (self.row_counts[row], self.col_counts[col], self.box_counts[(row // 3) * 3 + col // 3]):
+            if change < 0 and counts[val] == 1:
+                self.distinct -= 1
+            counts[val] += change
+            if change > 0 and counts[val] == 1:
+                self.distinct += 1
 
-        self.fitness = (((col_fitness + row_fitness + box_fitness) / 3 )/81)*100
+    def set_cell(self, row, col, val):
+        """
+        changes the value of one cell, updating the counts and the fitness in constant time
+        :param row: integer row the tile is in
+        :param col: integer column the tile is in
+        :param val: the new value of the cell
+        :return: None
+        """
+        self.count(row, col, self.brd[row][col], -1)
+        self.brd[row][col] = val
+        self.count(row, col, val, 1)
+        self.update_fitness()
 
-    def mutate(self):
+    def mutate(self, rate=0.2):
         """
         decides whether to mutate the current board, and if so, swaps 2 random elements in a random row
+        the board is changed in place and its fitness updated from the counts, which only change in the 2 cols and (at
+        most) 2 boxes of the swapped elements
+        :param rate: the probability of mutating the board
         :return: None
         """
         # print("MUTATE")
         # DECIDE WHETHER TO MUTATE THE CHILD
-        rate = 0.2
-        if random.uniform(0, 1) < 0.2:
+        if random.uniform(0, 1) < rate:
 
             # pick a row in the board, and within that, pick 2 values to swap
             row = random.randint(0, 8)
@@ -189,8 +217,7 @@ class Board:
                 v1 = random.randint(0, 8)
                 v2 = random.randint(0, 8)
 
-            new_brd = deepcopy(self.brd)
-            new_brd[row][v1] = self.brd[row][v2]
-            new_brd[row][v2] = self.brd[row][v1]
-            # print("MUTATED " + str((self.brd == new_brd)) + " ROW " + str(row))
-            self.brd = new_brd
+            val = self.brd[row][v1]
+            self.set_cell(row, v1, self.brd[row][v2])
+            self.set_cell(row, v2, val)
+            # print("MUTATED ROW " + str(row))
@@ -0,0 +1,192 @@
+# Import the libraries needed to run each island in its own process, and the genetic algorithm from main
+import multiprocessing
+import os
+import queue
+import numpy
+import main
+import population
+
+# The number of the fittest boards each island sends to the next island when they migrate
+MIGRANTS = 10
+# The number of generations between migrations
+MIGRATION_INTERVAL = 10
+# The number of seconds an island waits for the boards sent to it before checking whether the search has stopped
+STOP_POLL = 0.1
+# The number of seconds the main process waits for the result of an island before checking the islands are alive
+REPLY_TIMEOUT = 0.1
+
+
+class IslandFailed(RuntimeError):
+    """
+    Define a custom exception 'IslandFailed' to throw if an island process fails before sending its fittest board
+    """
+
+    def __init__(self, message="An island process failed before sending its fittest board"):
+        self.message = message
+        super().__init__(self.message)
+
+
+def island_worker(index, start_grid, population_size, selection, encoding, seed, max_generations, migrants, interval,
+                  inboxes, results, stop, verbose):
+    """
+    island_worker is the function run by each island process. The island evolves its own population with its own
+    random number generator, and every 'interval' generations sends copies of its fittest boards to the next island (in a
+    ring) and replaces its least fit boards with the boards sent to it by the previous island, waiting for them so the
+    islands migrate in step.
+    the island stops when it finds a solution (and sets the stop event so every other island stops), when another
+    island has found one, or when it has run 'max_generations' generations, and then sends ("done", index, board,
+    score, generations) with its fittest board on the results queue. If the island fails it sends ("error", index,
+    reason) instead, so the main process does not wait for it
+    :param index: the index of this island
+    :param start_grid: the 2D array of the grid to solve, with 0 for the empty cells
+    :param population_size: the number of boards in the population of this island
+    :param selection: the name of the selection algorithm
+    :param encoding: the name of the encoding of the boards
+    :param seed: the numpy SeedSequence of the random number generator of this island
+    :param max_generations: the largest number of generations to run, None to run until a solution is found
+    :param migrants: the number of boards sent to the next island at each migration
+    :param interval: the number of generations between migrations
+    :param inboxes: an array of the inbox queue of every island
+    :param results: the queue to send the fittest board to the main process on
+    :param stop: the multiprocessing Event set when any island has found a solution
+    :param verbose: True to printout the best fitness of the island at each migration to the console
+    :return: None
+    """
+    # the boards sent to an island that has stopped are never read, so do not wait for them to be sent before exiting
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+    try:
+        evolve_island(index, start_grid, population_size, selection, encoding, seed, max_generations, migrants,
+                      interval, inboxes, results, stop, verbose)
+    except (Exception, SystemExit) as e:
+        # exit() raises SystemExit, e.g. for an incorrect constant, which is reported like any other failure
+        results.put(("error", index, type(e).__name__ + ": " + str(e)))
+
+
+def evolve_island(index, start_grid, population_size, selection, encoding, seed, max_generations, migrants, interval,
+                  inboxes, results, stop, verbose):
+    """
+    evolve_island carries out the genetic algorithm of one island, taking the same parameters as island_worker
+    :return: None
+    """
+    rng = numpy.random.default_rng(seed)
+    pop, scores, free = main.create_population(start_grid, population_size, rng, encoding)
+    destination = inboxes[(index + 1) % len(inboxes)]
+
+    gens = 0
+    while not stop.is_set() and (max_generations is None or gens < max_generations):
+        gens += 1
+        pop, scores, found = main.next_generation(pop, scores, rng, selection, free)
+        if len(found) > 0:
+            stop.set()
+            break
+
+        if gens % interval == 0 and len(inboxes) > 1:
+            # send copies of the fittest boards to the next island
+            fittest = numpy.argsort(-scores, kind="stable")[:migrants]
+            destination.put((pop[fittest], scores[fittest]))
+            # wait for the boards sent by the previous island, so every run from the same seed migrates the same
+            # boards, unless the search has stopped
+            arrivals = None
+            while arrivals is None and not stop.is_set():
+                try:
+                    arrivals = inboxes[index].get(timeout=STOP_POLL)
+                except queue.Empty:
+                    pass
+            if arrivals is not None:
+                # replace the least fit boards with the boards sent to this island
+                weakest = numpy.argsort(scores, kind="stable")[:len(arrivals[0])]
+                pop[weakest] = arrivals[0]
+                scores[weakest] = arrivals[1]
+            if verbose:
+                print("Island " + str(index) + ", Generation " + str(gens) + ", Best Fitness - " +
+                      str(population.to_fitness(scores.max())))
+
+    best = main.get_fittest(scores)
+    results.put(("done", index, pop[best], int(scores[best]), gens))
+
+
+def run_islands(start_grid, islands=None, population_size=main.POPULATION_SIZE, selection=main.SELECTION,
+                max_generations=None, verbose=True, seed=None, encoding=main.ENCODING, migrants=MIGRANTS,
+                interval=MIGRATION_INTERVAL):
+    """
+    carries out the genetic algorithm as an island model, with the population split into several islands which each
+    evolve in their own process, and exchange their fittest boards every few generations. The islands keep more
+    diversity than one large population, as each converges on its own, and all stop as soon as any finds a solution
+    :param start_grid: the 2D array of the grid to solve, with 0 for the empty cells
+    :param islands: the number of islands (and processes), the number of CPUs if None
+    :param population_size: the number of boards in all the islands together
+    :param selection: the name of the selection algorithm
+    :param max_generations: the largest number of generations each island runs, None to run until a solution is found
+    :param verbose: True to printout the progress of each island to the console
+    :param seed: the seed of the random number generators, each island gets its own generator spawned from it
+    :param encoding: the name of the encoding of the boards
+    :param migrants: the number of boards each island sends to the next at each migration
+    :param interval: the number of generations between migrations
+    :return: a tuple of the fittest board of all the islands (the solution if its fitness is 100) and the largest
+             number of generations run by an island
+    :raises ValueError: if the selection or encoding is not known
+    :raises IslandFailed: if an island fails, the other islands are stopped
+    """
+    # check the arguments before starting any process, as an island which fails cannot be asked why
+    if selection not in main.SELECTIONS:
+        raise ValueError("INCORRECT SELECTION: " + str(selection) + ", must be one of " + str(main.SELECTIONS))
+    if encoding not in main.ENCODINGS:
+        raise ValueError("INCORRECT ENCODING: " + str(encoding) + ", must be one of " + str(main.ENCODINGS))
+    islands = islands or os.cpu_count()
+    seeds = numpy.random.SeedSequence(seed).spawn(islands)
+    inboxes = [multiprocessing.Queue() for i in range(0, islands)]
+    results = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=island_worker, daemon=True,
+                                         args=(i, start_grid, population_size // islands, selection, encoding, seeds[i],
+                                               max_generations, migrants, interval, inboxes, results, stop, verbose))
+                 for i in range(0, islands)]
+    for process in processes:
+        process.start()
+
+    def receive():
+        """
+        wait for the next result of an island, checking between waits that every island which has not sent its result
+        is still running, so an island which dies cannot hang the search
+        :return: the ("done", index, board, score, generations) tuple sent by the island
+        """
+        while True:
+            try:
+                reply = results.get(timeout=REPLY_TIMEOUT)
+            except queue.Empty:
+                reply = None
+            if reply is not None:
+                if reply[0] == "error":
+                    raise IslandFailed("Island " + str(reply[1]) + " failed, " + reply[2])
+                return reply
+            for i in range(0, islands):
+                # an island which finished sent its result before exiting (with exit code 0), so it is still to be read
+                if i not in replied and not processes[i].is_alive() and processes[i].exitcode != 0:
+                    raise IslandFailed("Island " + str(i) + " stopped with exit code " + str(processes[i].exitcode))
+
+    replies = []
+    replied = set()
+    try:
+        for i in range(0, islands):
+            replies.append(receive())
+            replied.add(replies[-1][1])
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+    # the results arrive in the order the islands finish, so order them by island to break ties the same way each run
+    replies.sort(key=lambda reply: reply[1])
+    best = max(replies, key=lambda reply: reply[3])
+    fittest = population.to_board(best[2])
+    if verbose and best[3] == population.MAX_SCORE:
+        print("FOUND SOLUTION ON ISLAND " + str(best[1]))
+        print(fittest)
+    return fittest, max(reply[4] for reply in replies)
+
+
+if __name__ == "__main__":
+    run_islands(main.start)
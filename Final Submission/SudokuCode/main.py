@@ -1,5 +1,7 @@
-from board import *
 import numpy
+import population
+import selection as selection_algorithms
+import solver
 
 grid1 = [[3, 0, 0, 0, 0, 5, 0, 4, 7], [0, 0, 6, 0, 4, 2, 0, 0, 1], [0, 0, 0, 0, 0, 7, 8, 9, 0], [0, 5, 0, 0, 1, 6, 0, 0, 2], [0, 0, 3, 0, 0, 0, 0, 0, 4], [8, 1, 0, 0, 0, 0, 7, 0, 0], [0, 0, 2, 0, 0, 0, 4, 0, 0], [5, 6, 0, 8, 7, 0, 1, 0, 0], [0, 0, 0, 3, 0, 0, 6, 0, 0]]
 grid2 = [[0, 0, 2, 0, 0, 0, 6, 3, 4], [1, 0, 6, 0, 0, 0, 5, 8, 0], [0, 0, 7, 3, 0, 0, 2, 9, 0], [0, 8, 5, 0, 0, 1, 0, 0, 6], [0, 0, 0, 7, 5, 0, 0, 2, 3], [0, 0, 3, 0, 0, 0, 0, 5, 0], [3, 1, 4, 0, 0, 2, 0, 0, 0], [0, 0, 9, 0, 8, 0, 4, 0, 0], [7, 2, 0, 0, 4, 0, 0, 0, 9]]
@@ -9,162 +11,225 @@ example = [[5, 3, 0, 0, 7, 0, 0, 0, 0], [6, 0, 0, 1, 9, 5, 0, 0, 0], [0, 9, 8, 0
 # CONSTANTS WHICH CAN BE CHANGED TO MODIFY THE RUNNING OF THE CODE
 POPULATION_SIZE = 10000
 SELECTION = "fittest"
+SELECTION = "tournament"
+SELECTION = "sus"
 SELECTION = "roulette"
+# THE NAMES OF THE SELECTION ALGORITHMS WHICH CAN BE USED
+SELECTIONS = list(selection_algorithms.SELECTIONS)
+# THE ENCODING OF THE BOARDS
+# "cells" - every cell can be changed by the crossover and mutation, including the given values
+# "permutation" - each row is a permutation of the values missing from it, and the given values are never changed
+ENCODING = "cells"
+ENCODING = "permutation"
+# THE NAMES OF THE ENCODINGS WHICH CAN BE USED
+ENCODINGS = ["cells", "permutation"]
+# THE WAY TO SOLVE THE GRID
+# "genetic" - evolve a population of boards with the genetic algorithm
+# "exact" - solve the grid with constraint propagation and backtracking (see solver.py)
+# "islands" - evolve several populations in parallel processes which exchange their fittest boards (see islands.py)
+MODE = "exact"
+MODE = "islands"
+MODE = "genetic"
 # THE GRID TO USE IN THE SOLUTION CAN BE CHANGED HERE
 start = example
 
 
-def get_fittest(my_list):
+def get_fittest(fitness):
     """
-    Function to take in a list of board instances and return the board with the greatest fitness
-    :param my_list: list of board instances
-    :return: a board instance which has the highest fitness
+    Function to take in the fitness values of the population and return the index of the board with the greatest fitness
+    :param fitness: array of the fitness of each board in the population
+    :return: the integer index of the board which has the highest fitness
     """
-    # print("GET FITTEST")
-    fittest = my_list[0]
-    for board in my_list:
-        if board.fitness > fittest.fitness:
-            fittest = board
-    return fittest
+    return int(numpy.argmax(fitness))
 
 
-def select_parents(population):
+def select_parents(fitness, count, rng, selection=None):
     """
-    calls the respective selection algorithm and returns its value
-    :param population: array containing all the board instances - the whole population
-    :return: a tuple with the 2 parent nodes that have been selected
+    calls the respective selection algorithm (see selection.py) and returns its value
+    :param fitness: array of the fitness of each board in the population
+    :param count: the number of children to select parents for
+    :param rng: the numpy Generator to draw the random values from
+    :param selection: the name of the selection algorithm, the SELECTION constant if not given
+    :return: a tuple of 2 arrays with the indices of the first and second parent of each child
     """
-    if SELECTION == "fittest":
-        return select_parents_fittest(population)
-    elif SELECTION == "roulette":
-        return select_parents_roulette(population)
-    else:
+    if selection is None:
+        selection = SELECTION
+    if selection not in selection_algorithms.SELECTIONS:
         print("INCORRECT SELECTION CONSTANT ENTERED IN main.py")
         exit()
+    return selection_algorithms.SELECTIONS[selection](fitness, count, rng)
 
 
-def select_parents_roulette(population):
+def combine(board1, board2, rng, rows_only=False):
     """
-    uses the roulette method to select 2 parents from the population
-    :param population: array containing all the board instances - the whole population
-    :return: a tuple with the 2 parent nodes that have been selected
+    the CROSSOVER function which takes pairs of parent boards and returns the children before mutation
+    each child is made with its own randomly chosen crossover and marker
+    :param board1: a (N, 9, 9) array of one of the parents of each child
+    :param board2: a (N, 9, 9) array of the other parent of each child
+    :param rng: the numpy Generator to draw the random values from
+    :param rows_only: True to only swap subsets of rows, which keeps each row of the children a row of a parent (as
+                      the clue-aware encoding needs)
+    :return: a (N, 9, 9) array of the children, each made of a combination of its two parents
     """
-    # print("SELECT PARENTS")
-    total_fitness = 0
-    for board in population:
-        total_fitness += board.fitness
-
-    board_probs = []
-    for board in population:
-        board_probs.append(board.fitness/total_fitness)
-
-    return numpy.random.choice(population, p=board_probs), numpy.random.choice(population, p=board_probs)
+    # 1 - swap a randomly selected subset of rows
+    # 2 - swap a randomly selected subset of columns
+    # 3 - swap a randomly selected subset of 3x3 boxes
+    size = len(board1)
+    subset = rng.integers(1, 2 if rows_only else 4, size=size)[:, None, None]
+    marker = rng.integers(0, 9, size=size)[:, None, None]
+    cells = numpy.arange(9)
+    # from_first is True for the cells each child takes from its first parent
+    from_first = numpy.where(subset == 1, cells[:, None] < marker,
+                             numpy.where(subset == 2, cells[None, :] <= marker, population.BOXES < marker))
+    return numpy.where(from_first, board1, board2)
 
 
-def select_parents_fittest(population):
+def create_population(start_grid, population_size, rng, encoding=ENCODING, presolve=False):
     """
-    gets the 2 fittest board instances from the population and returns these
-    :param population: array containing all the board instances - the whole population
-    :return: a tuple with the 2 parent nodes that have been selected
+    fills the population of the genetic algorithm from the grid to solve
+    :param start_grid: the 2D array of the grid to solve, with 0 for the empty cells
+    :param population_size: the number of boards in the population
+    :param rng: the numpy Generator to draw the random values from
+    :param encoding: the name of the encoding of the boards, "cells" or "permutation"
+    :param presolve: True to fill the cells forced by the given values with the exact solver before filling the
+                     population, so the population starts from a grid with more given values
+    :return: a tuple of the (P, 9, 9) array of boards, the array of their scores, and the blank cells of the grid which
+             mutation may swap (None if any cells may be swapped)
     """
-    #print("SELECT PARENTS")
-    tmp = deepcopy(population)
-    b1 = get_fittest(tmp)
-    tmp.remove(b1)
-    b2 = get_fittest(tmp)
-    return b1, b2
+    grid = start_grid
+    if presolve:
+        # the grid is left as it is if it has no solution, so the genetic algorithm still runs
+        grid = solver.presolve(start_grid) or start_grid
+    # fill the population array with the max number of boards
+    if encoding == "cells":
+        free = None
+        pop = population.fill_population(grid, population_size, rng)
+    elif encoding == "permutation":
+        # only the blank cells are changed, and every row always holds each value once so its count is not needed
+        free = population.free_cells(grid)
+        pop = population.fill_population(grid, population_size, rng, "permutation")
+    else:
+        print("INCORRECT ENCODING CONSTANT ENTERED IN main.py")
+        exit()
+    return pop, population.population_scores(pop, free is None), free
 
 
-def combine(board1, board2):
+def next_generation(pop, scores, rng, selection=SELECTION, free=None):
     """
-    the CROSSOVER function which takes two board instances and returns the child board before mutation
-    :param board1: one of the parent boards
-    :param board2: another on of the parent boards
-    :return: a new board instance which is made of a combination of the two parents
+    carries out one generation of the genetic algorithm, keeping the best half of the population and filling it back
+    up with mutated children
+    :param pop: the (P, 9, 9) array of the boards of the population
+    :param scores: the array of the scores of the boards
+    :param rng: the numpy Generator to draw the random values from
+    :param selection: the name of the selection algorithm
+    :param free: the blank cells of the grid which mutation may swap (see create_population)
+    :return: a tuple of the new population, the array of its scores and an array of the indices of its solutions
     """
-    # 1 - swap a randomly selected subset of rows
-    # 2 - swap a randomly selected subset of columns
-    # 3 - swap a randomly selected subset of 3x3 boxes
-    subset = random.randint(1, 3)
-    marker = random.randint(0, 8)
-    res = []
-    if subset == 1:
-        # print("ROW CROSSOVER")
-        # 1 - swap a randomly selected subset of rows
-
-        res += (board1.brd[0:marker])
-        res += (board2.brd[marker:len(board1.brd)])
-    elif subset == 2:
-        # 2 - swap a randomly selected subset of columns
-        # print("COL CROSSOVER")
-        for row in range(0, 9):
-            res_row = []
-            for col in range(0, 9):
-                if col <= marker:
-                    res_row.append(board1.brd[row][col])
-                else:
-                    res_row.append(board2.brd[row][col])
-            res.append(res_row)
-    else:
-        # print("BOX CROSSOVER")
-        # 3 - swap a randomly selected subset of 3x3 boxes
-        b1_boxes = board1.get_all_boxes()
-        b2_boxes = board1.get_all_boxes()
-        res += (b1_boxes[0:marker])
-        res += (b2_boxes[marker:len(b2_boxes)])
-
-    return Board(res)
-
-"""
-This main block of code carries out the iterations of the genetic algorithm until a solution is found
-"""
-# Create the start board
-game = Board(start)
-# declare an array for the population
-population = []
-# fill this population array with the max number of boards
-for i in range(POPULATION_SIZE):
-    population.append(game.fill())
-
-# printout information to the console
-print("START CODE HERE")
-print(population[0])
-print("Start Fitness - " + str(population[0].fitness))
-
-# set a counter for the number of generations
-gens = 0
-
-found = False
-while not found:
+    population_size = len(pop)
+    count_rows = free is None
 
     # Get the best half of the population
-    population.sort()
-    population.reverse()
-    population = population[:len(population)//2]
-
-    # output the best fitness achieved so far
-    best_fitness = str(get_fittest(population).fitness)
-    # increment generations
-    gens += 1
-    print("Generation " + str(gens) + ", Best Fitness - " + best_fitness)
+    best = numpy.argsort(-scores, kind="stable")[:population_size // 2]
+    pop = pop[best]
+    scores = scores[best]
 
-    # Select 2 parents
+    # create new children to fill the population back to max capacity
+    count = population_size - len(pop)
+    # Select 2 parents for each child
     # This is done by the function defined at the top
-    parents = select_parents(population)
-
-    # while the population isnt at max capacity, create new children to fill it
-    while len(population) < POPULATION_SIZE:
-        # RECOMBINE PAIRS OF PARENTS (CROSSOVER)
-        child = combine(parents[0], parents[1])
-        # MUTATE THE CHILD - THIS HAPPENS WITH A CERTAIN PROBABILITY
-        child.mutate()
-        # Append this child to the population
-        population.append(child)
-
-        # check if this child is the solution
-        if child.fitness == 100:
+    first, second = select_parents(population.to_fitness(scores), count, rng, selection)
+    # RECOMBINE PAIRS OF PARENTS (CROSSOVER)
+    children = combine(pop[first], pop[second], rng, not count_rows)
+    child_scores = population.population_scores(children, count_rows)
+    # MUTATE THE CHILDREN - THIS HAPPENS WITH A CERTAIN PROBABILITY, THEIR SCORES ARE UPDATED BY THE SWAP
+    population.mutate(children, rng, scores=child_scores, free=free)
+
+    # check if any child is the solution, and append the children to the population
+    found = len(pop) + numpy.flatnonzero(child_scores == population.MAX_SCORE)
+    return numpy.concatenate((pop, children)), numpy.concatenate((scores, child_scores)), found
+
+
+def run_ga(start_grid, population_size=POPULATION_SIZE, selection=SELECTION, max_generations=None, verbose=True,
+           seed=None, encoding=ENCODING, presolve=False, repair=False):
+    """
+    carries out the iterations of the genetic algorithm until a solution is found
+    the population is held as a single (P, 9, 9) array, and Board instances are only created for the output
+    :param start_grid: the 2D array of the grid to solve, with 0 for the empty cells
+    :param population_size: the number of boards in the population
+    :param selection: the name of the selection algorithm, one of SELECTIONS
+    :param max_generations: the largest number of generations to run, None to run until a solution is found
+    :param verbose: True to printout the progress of each generation to the console
+    :param seed: the seed of the random number generator, the same seed always gives the same generations
+    :param encoding: the name of the encoding of the boards, "cells" or "permutation"
+    :param presolve: True to fill the cells forced by the given values with the exact solver before filling the
+                     population, so the population starts from a grid with more given values
+    :param repair: True to repair the fittest board into a solution with the exact solver if the generations run out
+                   without finding one
+    :return: a tuple of the fittest board (the solution if its fitness is 100) and the number of generations run
+    """
+    rng = numpy.random.default_rng(seed)
+    pop, scores, free = create_population(start_grid, population_size, rng, encoding, presolve)
+
+    # printout information to the console
+    if verbose:
+        print("START CODE HERE")
+        print(population.to_board(pop[0]))
+        print("Start Fitness - " + str(population.to_fitness(scores[0])))
+
+    # set a counter for the number of generations
+    gens = 0
+
+    solution = None
+    while solution is None and (max_generations is None or gens < max_generations):
+
+        # output the best fitness achieved so far
+        best_fitness = str(population.to_fitness(scores[get_fittest(scores)]))
+        # increment generations
+        gens += 1
+        if verbose:
+            print("Generation " + str(gens) + ", Best Fitness - " + best_fitness)
+
+        pop, scores, found = next_generation(pop, scores, rng, selection, free)
+        if len(found) > 0:
+            solution = population.to_board(pop[found[0]])
+            if verbose:
+                print("FOUND SOLUTION")
+                print(solution)
+
+    fittest = population.to_board(pop[get_fittest(scores)])
+    if repair and solution is None:
+        repaired = solver.repair(fittest.brd, start_grid)
+        if repaired is not None:
+            if verbose:
+                print("REPAIRED SOLUTION")
+                print(repaired)
+            fittest = repaired
+    return fittest, gens
+
+
+def run_exact(start_grid, verbose=True):
+    """
+    solves the grid with the exact solver
+    :param start_grid: the 2D array of the grid to solve, with 0 for the empty cells
+    :param verbose: True to printout the solution to the console
+    :return: the solution board, or None if the grid has no solution
+    """
+    solution = solver.solve(start_grid)
+    if verbose:
+        if solution is None:
+            print("NO SOLUTION")
+        else:
             print("FOUND SOLUTION")
-            print(child)
-            found = True
+            print(solution)
+    return solution
 
-exit()
\ No newline at end of file
+
+if __name__ == "__main__":
+    if MODE == "exact":
+        run_exact(start)
+    elif MODE == "islands":
+        # imported here as islands.py imports this file
+        import islands
+        islands.run_islands(start)
+    else:
+        run_ga(start)
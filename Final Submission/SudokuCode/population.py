@@ -0,0 +1,198 @@
+# Import numpy to hold the whole population in a single array, and the Board Class for the edges of the algorithm
+import numpy
+from board import Board
+
+# The probability of mutating each child
+MUTATION_RATE = 0.2
+# The index of the 3x3 box each cell of the grid is in
+BOXES = (numpy.arange(9)[:, None] // 3) * 3 + numpy.arange(9)[None, :] // 3
+# The flat indices (row * 9 + col) of the cells in each 3x3 box
+BOX_CELLS = numpy.argsort(BOXES.ravel(), kind="stable").reshape(9, 9)
+# The count of distinct values in every row, col and box of a solved board
+MAX_SCORE = 243
+# The number of bits set in each bitmask of the values 0 to 9, used to count the distinct values in a row, col or box
+POPCOUNT = numpy.array([bin(mask).count("1") for mask in range(0, 1 << 10)], dtype=numpy.int16)
+
+
+def fill_population(grid, size, rng, fill=None):
+    """
+    creates a population of filled boards from a grid, as a single array, using one of 3 algorithms
+    * "random" - puts a random value between 1 and 9 in each blank space
+    * "weighted" - puts a random value which isnt a given value in the row, col or 3x3 box of each blank space, any
+      blanks with no such value get a random value between 1 and 9
+    * "permutation" - fills the blank spaces of each row with the values missing from the row, in a random order, so
+      every row holds each value once (the clue-aware encoding)
+    :param grid: the 2D array of the grid, with 0 for the empty cells
+    :param size: the number of boards in the population
+    :param rng: the numpy Generator to draw the random values from
+    :param fill: the name of the fill algorithm, the FILL constant of the Board class if not given
+    :return: a (size, 9, 9) array of the filled boards
+    """
+    if fill is None:
+        fill = Board.FILL
+    grid = numpy.array(grid, dtype=numpy.int8)
+    blanks = grid == 0
+    population = numpy.repeat(grid[None], size, axis=0)
+    if fill == "random":
+        values = rng.integers(1, 10, size=population.shape, dtype=numpy.int8)
+    elif fill == "weighted":
+        # allowed[row, col, val] is True if val isnt a given value in the row, col or box of the cell
+        givens = grid[..., None] == numpy.arange(1, 10)
+        rows = givens.any(axis=1)
+        cols = givens.any(axis=0)
+        boxes = givens.reshape(3, 3, 3, 3, 9).any(axis=(1, 3)).reshape(9, 9)
+        allowed = ~(rows[:, None] | cols[None, :] | boxes[BOXES])
+        allowed[~allowed.any(axis=2)] = True
+        # pick one of the allowed values at random, by taking the allowed value with the largest random key
+        keys = rng.random((size, 9, 9, 9)) * allowed
+        values = (keys.argmax(axis=3) + 1).astype(numpy.int8)
+    elif fill == "permutation":
+        values = numpy.zeros(population.shape, dtype=numpy.int8)
+        for row in range(0, 9):
+            missing = numpy.setdiff1d(numpy.arange(1, 10, dtype=numpy.int8), grid[row])
+            values[:, row, blanks[row]] = rng.permuted(numpy.tile(missing, (size, 1)), axis=1)
+    else:
+        print("INCORRECT FILL CONSTANT ENTERED IN board.py")
+        exit()
+    population[:, blanks] = values[:, blanks]
+    return population
+
+
+def population_scores(population, rows=True):
+    """
+    counts the distinct values in every row, col and box of every board in the population at once, the fitness of a
+    board is calculated from this count (see to_fitness)
+    the values in each row, col and box are ORed together as bits, so the number of distinct values is the number of
+    bits set
+    :param population: a (P, 9, 9) array of boards
+    :param rows: False to skip counting the rows, for boards whose rows are known to hold every value (as in the
+                 clue-aware encoding)
+    :return: an array of the P integer counts, MAX_SCORE for a solution
+    """
+    bits = numpy.left_shift(1, population, dtype=numpy.int16)
+    size = len(population)
+    if rows:
+        row_score = POPCOUNT[numpy.bitwise_or.reduce(bits, axis=2)].sum(axis=1)
+    else:
+        row_score = 81
+    col_score = POPCOUNT[numpy.bitwise_or.reduce(bits, axis=1)].sum(axis=1)
+    boxes = bits.reshape(size, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(size, 9, 9)
+    box_score = POPCOUNT[numpy.bitwise_or.reduce(boxes, axis=2)].sum(axis=1)
+    return (row_score + col_score + box_score).astype(numpy.int32)
+
+
+def to_fitness(scores):
+    """
+    converts counts of distinct values into fitness values, in the same way as Board.set_fitness
+    :param scores: an array (or a single integer) of counts of distinct values
+    :return: an array (or a single float) of the fitness values, 100 for a solution
+    """
+    return ((scores / 3) / 81) * 100
+
+
+def population_fitness(population):
+    """
+    calculates the fitness of every board in the population at once, in the same way as Board.set_fitness
+    :param population: a (P, 9, 9) array of boards
+    :return: an array of the P fitness values
+    """
+    return to_fitness(population_scores(population))
+
+
+def count_lost(cells, val):
+    """
+    returns whether removing a value from a row, col or box leaves none of it there, for several boards at once
+    :param cells: a (N, 9) array of the values in the row, col or box of each board
+    :param val: an array of the N values removed
+    :return: an integer array of 1 where the value is lost and 0 where not
+    """
+    return ((cells == val[:, None]).sum(axis=1) == 1).astype(numpy.int32)
+
+
+def count_gained(cells, val):
+    """
+    returns whether adding a value to a row, col or box adds a new distinct value, for several boards at once
+    :param cells: a (N, 9) array of the values in the row, col or box of each board
+    :param val: an array of the N values added
+    :return: an integer array of 1 where the value is new and 0 where not
+    """
+    return (~(cells == val[:, None]).any(axis=1)).astype(numpy.int32)
+
+
+def free_cells(grid):
+    """
+    finds the blank cells of each row of a grid, which are the only cells the clue-aware encoding changes
+    :param grid: the 2D array of the grid, with 0 for the empty cells
+    :return: a tuple of a (9, 9) array of the columns of the blank cells of each row (in order, padded with 0) and an
+             array of the number of blank cells in each row
+    """
+    grid = numpy.array(grid)
+    counts = (grid == 0).sum(axis=1)
+    cols = numpy.zeros((9, 9), dtype=numpy.int64)
+    for row in range(0, 9):
+        cols[row, :counts[row]] = numpy.flatnonzero(grid[row] == 0)
+    return cols, counts
+
+
+def mutate(population, rng, rate=MUTATION_RATE, scores=None, free=None):
+    """
+    decides whether to mutate each board in the population, and for those that are, swaps 2 random elements in a
+    random row, in place
+    a swap within a row leaves the counts of the row unchanged, so the scores are updated from only the 2 cols and (at
+    most) 2 boxes of the swapped elements, rather than recounted
+    :param population: a (P, 9, 9) array of boards
+    :param rng: the numpy Generator to draw the random values from
+    :param rate: the probability of mutating each board
+    :param scores: the array of the P scores of the boards (see population_scores) to update in place, None to leave
+                   the scores to be recounted
+    :param free: the blank cells of the grid (see free_cells) to only swap 2 blank cells, so the given values never
+                 move, None to swap any 2 cells
+    :return: an array of the indices of the mutated boards
+    """
+    mutated = numpy.flatnonzero(rng.random(len(population)) < rate)
+    if free is None:
+        # pick a row in each board, and within that, pick 2 different values to swap
+        rows = rng.integers(0, 9, size=len(mutated))
+        v1 = rng.integers(0, 9, size=len(mutated))
+        v2 = (v1 + rng.integers(1, 9, size=len(mutated))) % 9
+    else:
+        # pick a row with at least 2 blank cells in each board, and within that, pick 2 different blank cells to swap
+        cols, counts = free
+        swappable = numpy.flatnonzero(counts >= 2)
+        if len(swappable) == 0:
+            return mutated[:0]
+        rows = swappable[rng.integers(0, len(swappable), size=len(mutated))]
+        i1 = rng.integers(0, counts[rows])
+        i2 = (i1 + rng.integers(1, counts[rows])) % counts[rows]
+        v1 = cols[rows, i1]
+        v2 = cols[rows, i2]
+    a = population[mutated, rows, v1]
+    b = population[mutated, rows, v2]
+
+    if scores is not None:
+        # the change in the number of distinct values in each col and box, from a moving to the cell of b and b to
+        # the cell of a (nothing changes if the values are the same)
+        cols1 = population[mutated, :, v1]
+        cols2 = population[mutated, :, v2]
+        change = count_gained(cols1, b) - count_lost(cols1, a) + count_gained(cols2, a) - count_lost(cols2, b)
+        # boxes only change if the elements are in different boxes
+        box1 = BOX_CELLS[BOXES[rows, v1]]
+        box2 = BOX_CELLS[BOXES[rows, v2]]
+        boxes1 = population.reshape(len(population), 81)[mutated[:, None], box1]
+        boxes2 = population.reshape(len(population), 81)[mutated[:, None], box2]
+        box_change = count_gained(boxes1, b) - count_lost(boxes1, a) + count_gained(boxes2, a) - count_lost(boxes2, b)
+        change += numpy.where(v1 // 3 != v2 // 3, box_change, 0)
+        scores[mutated] += numpy.where(a != b, change, 0)
+
+    population[mutated, rows, v1] = b
+    population[mutated, rows, v2] = a
+    return mutated
+
+
+def to_board(individual):
+    """
+    creates a Board instance of one board of the population, for printing and returning results
+    :param individual: a (9, 9) array of the board
+    :return: a Board instance with its fitness set
+    """
+    return Board(individual.tolist())
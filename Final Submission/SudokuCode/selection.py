@@ -0,0 +1,103 @@
+# Import numpy to draw the parents of every child at once
+import numpy
+
+# The number of boards drawn for each tournament, the fittest of which is the parent
+TOURNAMENT_SIZE = 3
+
+
+def build_alias(weights):
+    """
+    builds the alias table of a set of weights (Vose's method), so an index can be drawn with probability in proportion
+    to its weight in constant time: draw a column uniformly, then keep it with its probability or else take its alias
+    :param weights: an array of the non-negative weights, at least one above 0
+    :return: a tuple of the array of the probability of keeping each column and the array of the alias of each column
+    """
+    size = len(weights)
+    prob = (numpy.asarray(weights, dtype=float) * size / numpy.sum(weights)).tolist()
+    alias = list(range(0, size))
+    small = [i for i in range(0, size) if prob[i] < 1]
+    large = [i for i in range(0, size) if prob[i] >= 1]
+    while small and large:
+        # fill the rest of a small column with part of a large column
+        less = small.pop()
+        more = large[-1]
+        alias[less] = more
+        prob[more] -= 1 - prob[less]
+        if prob[more] < 1:
+            small.append(large.pop())
+    # the columns left are full, up to rounding errors
+    for i in small + large:
+        prob[i] = 1
+    return numpy.array(prob), numpy.array(alias)
+
+
+def select_fittest(fitness, count, rng):
+    """
+    gets the 2 fittest boards from the population as the parents of every child
+    :param fitness: array of the fitness of each board in the population
+    :param count: the number of children
+    :param rng: the numpy Generator to draw the random values from (unused, as the choice is not random)
+    :return: a tuple of 2 arrays with the indices of the first and second parent of each child
+    """
+    b1, b2 = numpy.argsort(-fitness, kind="stable")[:2]
+    return numpy.full(count, b1), numpy.full(count, b2)
+
+
+def select_roulette(fitness, count, rng):
+    """
+    uses the roulette method to select the parents of each child, each parent is drawn with probability in proportion
+    to its fitness
+    the boards are grouped by their fitness, which takes few distinct values, and an alias table of the groups
+    (weighted by their total fitness) draws a group in constant time, then a board is drawn uniformly from the group
+    :param fitness: array of the fitness of each board in the population
+    :param count: the number of children
+    :param rng: the numpy Generator to draw the random values from
+    :return: a tuple of 2 arrays with the indices of the first and second parent of each child
+    """
+    values, groups, sizes = numpy.unique(fitness, return_inverse=True, return_counts=True)
+    prob, alias = build_alias(values * sizes)
+    # the boards ordered by group, and the position of the first board of each group in that order
+    order = numpy.argsort(groups, kind="stable")
+    starts = numpy.cumsum(sizes) - sizes
+
+    column = rng.integers(0, len(values), size=2 * count)
+    group = numpy.where(rng.random(2 * count) < prob[column], column, alias[column])
+    parents = order[starts[group] + (rng.random(2 * count) * sizes[group]).astype(numpy.int64)]
+    return parents[:count], parents[count:]
+
+
+def select_sus(fitness, count, rng):
+    """
+    uses stochastic universal sampling to select the parents of each child. The parents are picked by equally spaced
+    pointers over the cumulative fitness from a single random start, so each board is picked close to its expected
+    number of times, then the picked parents are shuffled into random pairs
+    :param fitness: array of the fitness of each board in the population
+    :param count: the number of children
+    :param rng: the numpy Generator to draw the random values from
+    :return: a tuple of 2 arrays with the indices of the first and second parent of each child
+    """
+    total = numpy.cumsum(fitness)
+    pointers = (rng.random() + numpy.arange(0, 2 * count)) * (total[-1] / (2 * count))
+    parents = numpy.minimum(numpy.searchsorted(total, pointers, side="right"), len(fitness) - 1)
+    parents = rng.permutation(parents)
+    return parents[:count], parents[count:]
+
+
+def select_tournament(fitness, count, rng, size=TOURNAMENT_SIZE):
+    """
+    uses tournament selection to select the parents of each child, each parent is the fittest of a few boards drawn
+    at random from the population
+    :param fitness: array of the fitness of each board in the population
+    :param count: the number of children
+    :param rng: the numpy Generator to draw the random values from
+    :param size: the number of boards drawn for each tournament
+    :return: a tuple of 2 arrays with the indices of the first and second parent of each child
+    """
+    entrants = rng.integers(0, len(fitness), size=(2 * count, size))
+    parents = entrants[numpy.arange(0, 2 * count), numpy.argmax(fitness[entrants], axis=1)]
+    return parents[:count], parents[count:]
+
+
+# The selection algorithms which can be used, by name
+SELECTIONS = {"fittest": select_fittest, "roulette": select_roulette, "sus": select_sus,
+              "tournament": select_tournament}
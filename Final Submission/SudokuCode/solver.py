@@ -0,0 +1,247 @@
+# Import the Board Class to return solutions as boards
+from board import Board
+
+# The bitmask of the values 1 to 9, bit n is set for the value n
+ALL = 0x3FE
+# The row, col and box of each of the 81 cells, numbered row by row
+ROW = [cell // 9 for cell in range(0, 81)]
+COL = [cell % 9 for cell in range(0, 81)]
+BOX = [(cell // 27) * 3 + (cell % 9) // 3 for cell in range(0, 81)]
+# The cells of each of the 27 rows, cols and boxes
+UNITS = ([[cell for cell in range(0, 81) if ROW[cell] == i] for i in range(0, 9)] +
+         [[cell for cell in range(0, 81) if COL[cell] == i] for i in range(0, 9)] +
+         [[cell for cell in range(0, 81) if BOX[cell] == i] for i in range(0, 9)])
+
+
+def count_bits(mask):
+    """
+    returns the number of values in a bitmask
+    :param mask: the bitmask of values
+    :return: the integer number of bits set
+    """
+    return bin(mask).count("1")
+
+
+class Solver:
+    """
+    Class to solve a Sudoku grid exactly, rather than evolving a solution. The values used in each row, col and box are
+    kept as bitmasks, so the candidate values of a cell are the values missing from all three.
+    the solver fills the naked singles (cells with one candidate) and hidden singles (values with one possible cell in
+    a row, col or box) until neither is left, then guesses a value for the cell with the fewest candidates and
+    backtracks if the guess leads to a contradiction
+    """
+
+    def __init__(self, grid):
+        """
+        the init function sets up the bitmasks from the given values of the grid
+        :param grid: the 2D array of the grid, with 0 for the empty cells
+        """
+        self.cells = [val for row in grid for val in row]
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+        # False if the grid repeats a given value in a row, col or box, so it cannot be solved
+        self.valid = True
+        # the number of guesses made by the search
+        self.guesses = 0
+        for cell in range(0, 81):
+            val = self.cells[cell]
+            if val != 0:
+                if self.used(cell) & (1 << val):
+                    self.valid = False
+                self.set_bits(cell, 1 << val)
+
+    def used(self, cell):
+        """
+        returns the values used in the row, col and box of a cell
+        :param cell: the index of the cell
+        :return: the bitmask of the values
+        """
+        return self.rows[ROW[cell]] | self.cols[COL[cell]] | self.boxes[BOX[cell]]
+
+    def candidates(self, cell):
+        """
+        returns the values which can be put in an empty cell
+        :param cell: the index of the cell
+        :return: the bitmask of the values
+        """
+        return ALL & ~self.used(cell)
+
+    def set_bits(self, cell, bit):
+        """
+        marks a value as used in the row, col and box of a cell
+        :param cell: the index of the cell
+        :param bit: the bitmask of the value
+        :return: None
+        """
+        self.rows[ROW[cell]] |= bit
+        self.cols[COL[cell]] |= bit
+        self.boxes[BOX[cell]] |= bit
+
+    def place(self, cell, val, trail):
+        """
+        puts a value in an empty cell, and records the cell on the trail so it can be undone
+        :param cell: the index of the cell
+        :param val: the value to put in the cell
+        :param trail: the array of the cells filled so far
+        :return: None
+        """
+        self.cells[cell] = val
+        self.set_bits(cell, 1 << val)
+        trail.append(cell)
+
+    def undo(self, trail, length=0):
+        """
+        empties the cells filled since the trail was a given length, in reverse order
+        :param trail: the array of the cells filled so far
+        :param length: the length of the trail to go back to
+        :return: None
+        """
+        while len(trail) > length:
+            cell = trail.pop()
+            bit = ~(1 << self.cells[cell])
+            self.cells[cell] = 0
+            self.rows[ROW[cell]] &= bit
+            self.cols[COL[cell]] &= bit
+            self.boxes[BOX[cell]] &= bit
+
+    def propagate(self, trail):
+        """
+        fills every naked and hidden single, repeating until there are none left
+        :param trail: the array of the cells filled so far, the filled cells are added to it
+        :return: False if a cell has no candidates or a value has no possible cell in a row, col or box, else True
+        """
+        changed = True
+        while changed:
+            changed = False
+            # naked singles - the empty cells with only one candidate
+            for cell in range(0, 81):
+                if self.cells[cell] == 0:
+                    cand = self.candidates(cell)
+                    if cand == 0:
+                        return False
+                    if cand & (cand - 1) == 0:
+                        self.place(cell, cand.bit_length() - 1, trail)
+                        changed = True
+
+            # hidden singles - the values which are a candidate of only one empty cell in a row, col or box
+            for unit in UNITS:
+                once = 0
+                twice = 0
+                used = 0
+                for cell in unit:
+                    if self.cells[cell] == 0:
+                        cand = self.candidates(cell)
+                        twice |= once & cand
+                        once |= cand
+                    else:
+                        used |= 1 << self.cells[cell]
+                if (once | used) != ALL:
+                    return False
+                singles = once & ~twice
+                if singles == 0:
+                    continue
+                for cell in unit:
+                    if self.cells[cell] == 0:
+                        bit = self.candidates(cell) & singles
+                        if bit & (bit - 1):
+                            # the cell is the only place for 2 values
+                            return False
+                        if bit:
+                            self.place(cell, bit.bit_length() - 1, trail)
+                            changed = True
+        return True
+
+    def search(self, hint=None):
+        """
+        fills the singles, then tries each candidate of the empty cell with the fewest candidates in turn, searching
+        on from each until the grid is full
+        :param hint: a 2D array of values to try first in each cell, None to try the values in order
+        :return: True if the grid was filled, else False (with the cells filled by this call emptied again)
+        """
+        trail = []
+        if not self.propagate(trail):
+            self.undo(trail)
+            return False
+
+        # find the empty cell with the fewest candidates
+        best = None
+        best_count = 10
+        for cell in range(0, 81):
+            if self.cells[cell] == 0:
+                cand_count = count_bits(self.candidates(cell))
+                if cand_count < best_count:
+                    best = cell
+                    best_count = cand_count
+                    if cand_count == 2:
+                        break
+        if best is None:
+            return True
+
+        cand = self.candidates(best)
+        values = [val for val in range(1, 10) if cand & (1 << val)]
+        if hint is not None and hint[ROW[best]][COL[best]] in values:
+            values.remove(hint[ROW[best]][COL[best]])
+            values.insert(0, hint[ROW[best]][COL[best]])
+        for val in values:
+            self.guesses += 1
+            self.place(best, val, trail)
+            if self.search(hint):
+                return True
+            self.undo(trail, len(trail) - 1)
+        self.undo(trail)
+        return False
+
+    def grid(self):
+        """
+        returns the values of the cells as a grid
+        :return: a 2D array of the values, with 0 for the empty cells
+        """
+        return [self.cells[row * 9:(row + 1) * 9] for row in range(0, 9)]
+
+    def solve(self, hint=None):
+        """
+        solves the grid
+        :param hint: a 2D array of values to try first in each cell, None to try the values in order
+        :return: a 2D array of the solution, or None if the grid has no solution
+        """
+        if not self.valid or not self.search(hint):
+            return None
+        return self.grid()
+
+
+def solve(grid, hint=None):
+    """
+    solves a grid exactly with a Solver
+    :param grid: the 2D array of the grid, with 0 for the empty cells
+    :param hint: a 2D array of values to try first in each cell, None to try the values in order
+    :return: a Board instance of the solution, or None if the grid has no solution
+    """
+    solution = Solver(grid).solve(hint)
+    if solution is None:
+        return None
+    return Board(solution)
+
+
+def presolve(grid):
+    """
+    fills the cells of a grid whose values are forced by the given values (the naked and hidden singles), which every
+    solution shares, without guessing. Used to seed the genetic algorithm with a grid with more given values
+    :param grid: the 2D array of the grid, with 0 for the empty cells
+    :return: a 2D array of the grid with the forced cells filled, or None if the grid has no solution
+    """
+    solver = Solver(grid)
+    if not solver.valid or not solver.propagate([]):
+        return None
+    return solver.grid()
+
+
+def repair(board, grid):
+    """
+    repairs a board of the genetic algorithm into a solution of the grid, by solving the grid while trying the value
+    of the board first in each cell, so the solution keeps as many of the values of the board as the search finds
+    :param board: the 2D array of the board to repair
+    :param grid: the 2D array of the grid, with 0 for the empty cells
+    :return: a Board instance of the solution, or None if the grid has no solution
+    """
+    return solve(grid, board)
@@ -0,0 +1,368 @@
+# Import the libraries needed to time the solvers, measure their memory and store the results
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# The directory holding this file, the code of each suite is in a directory below it
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# The directory of the code of each suite, both have a module called board so each suite runs in its own process
+SUITES = {"astar": "AStarCode", "sudoku": "SudokuCode"}
+
+# The goal board of the 8-Puzzle corpus
+GOAL = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+# The ranges of optimal solution lengths the 8-Puzzle corpus is grouped by
+DEPTHS = ((0, 9), (10, 14), (15, 19), (20, 24), (25, 31))
+# The names of the Sudoku grids in the corpus, as named in SudokuCode/main.py
+GRIDS = ("grid1", "grid2", "grid3", "example")
+
+# The search strategies which do not use a heuristic
+NO_HEURISTIC = ("Distance Table", "External BFS")
+
+# The metrics where a smaller value is an improvement, every other metric is better when larger
+LOWER_IS_BETTER = ("wall_time", "expanded", "peak_memory", "generations", "limits", "guesses")
+# The metrics derived from the time a benchmark took, which vary from run to run even when the code is unchanged
+TIME_METRICS = ("wall_time", "nodes_per_second", "generations_per_second")
+# The shortest baseline time (in seconds) worth comparing, the time metrics of shorter benchmarks are mostly noise
+MIN_DURATION = 0.05
+
+
+def measure(func, memory, repeats=1):
+    """
+    function to call a function and measure how long it takes, or the peak memory it allocates
+    the function is timed several times and the median time is taken, so one slow call does not skew the result. The
+    memory is measured in a separate call, as tracing the allocations slows the call down
+    :param func: the function to call, with no parameters
+    :param memory: True to also call the function again with tracemalloc running
+    :param repeats: the number of times to time the function
+    :return: a tuple of the result of the last call, the median time it took in seconds and the peak memory in bytes
+             (None if it was not measured)
+    """
+    times = []
+    for i in range(0, repeats):
+        st = time.perf_counter()
+        res = func()
+        times.append(time.perf_counter() - st)
+    wall_time = statistics.median(times)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return res, wall_time, peak
+
+
+def make_corpus(seed, per_depth):
+    """
+    function to generate the seeded corpus of 8-Puzzle boards, grouped by the length of their optimal solution
+    boards are generated as random walks from the goal (for the short solutions) or random shuffles (for the long ones)
+    and sorted into groups by their distance in the exact distance table, until every group is full
+    :param seed: the seed of the random number generator, the same seed always gives the same corpus
+    :param per_depth: the number of boards in each group
+    :return: a dictionary of group names to arrays of (start board, optimal cost) tuples, the "unsolvable" group holds
+             boards of the wrong parity with a cost of None
+    """
+    from board import Board, get_neighbours
+    from distance_table import distance_table_solve
+
+    rng = random.Random(seed)
+    neighbours = get_neighbours(3)
+    goal = Board(GOAL)
+    corpus = {"%d-%d" % depth: [] for depth in DEPTHS}
+    corpus["unsolvable"] = []
+    seen = set()
+    while any(len(group) < per_depth for group in corpus.values()):
+        tiles = [num for row in GOAL for num in row]
+        if rng.random() < 0.5:
+            # walk the blank around the board from the goal
+            blank = tiles.index(0)
+            for i in range(0, rng.randint(0, 40)):
+                point = rng.choice(neighbours[blank])
+                tiles[blank], tiles[point] = tiles[point], 0
+                blank = point
+        else:
+            rng.shuffle(tiles)
+        start_board = [tiles[row * 3:(row + 1) * 3] for row in range(0, 3)]
+        if tuple(tiles) in seen:
+            continue
+        seen.add(tuple(tiles))
+
+        if not Board(start_board).is_solvable(goal):
+            name = "unsolvable"
+            cost = None
+        else:
+            cost = distance_table_solve(start_board, GOAL)[0]
+            name = next("%d-%d" % depth for depth in DEPTHS if depth[0] <= cost <= depth[1])
+        if len(corpus[name]) < per_depth:
+            corpus[name].append((start_board, cost))
+    return corpus
+
+
+def run_astar_suite(args):
+    """
+    function to run every search strategy with every heuristic over the 8-Puzzle corpus
+    :param args: the parsed command line arguments
+    :return: a dictionary of "search/heuristic/group" names to dictionaries of metrics
+    """
+    from budget import Budget, SearchLimitExceeded
+    from heuristics import HEURISTICS
+    from solvers import SOLVERS
+
+    corpus = make_corpus(args.seed, args.per_depth)
+    results = {}
+    for search in args.searches or list(SOLVERS):
+        # some searches do not use a heuristic, so they only need running once
+        heuristics = ["-"] if search in NO_HEURISTIC else args.heuristics or list(HEURISTICS)
+        for algo in heuristics:
+            for name, group in corpus.items():
+                res = {"instances": len(group), "solved": 0, "limits": 0, "expanded": 0, "cost": 0, "optimal_cost": 0,
+                       "wall_time": 0.0, "peak_memory": 0}
+                for start_board, optimal in group:
+                    try:
+                        solution, wall_time, peak = measure(
+                            lambda: SOLVERS[search](start_board, GOAL, algo, Budget(time_limit=args.time_limit)),
+                            args.memory, args.repeats)
+                    except SearchLimitExceeded:
+                        res["limits"] += 1
+                        continue
+                    except ValueError as e:
+                        # the search cannot use this heuristic (or board size), so there is nothing to measure
+                        res["unsupported"] = str(e)
+                        break
+                    res["wall_time"] += wall_time
+                    res["peak_memory"] = max(res["peak_memory"], peak or 0)
+                    res["expanded"] += solution.stats.expanded
+                    if len(solution) > 0:
+                        res["solved"] += 1
+                        res["cost"] += solution[0]
+                        res["optimal_cost"] += optimal
+                res["nodes_per_second"] = res["expanded"] / res["wall_time"] if res["wall_time"] > 0 else 0.0
+                results["%s/%s/%s" % (search, algo, name)] = res
+                print(format_row("%s/%s/%s" % (search, algo, name), res), file=sys.stderr)
+    return results
+
+
+def run_sudoku_suite(args):
+    """
+    function to run the genetic algorithm with every selection algorithm and encoding, the island model and the exact
+    solver over the Sudoku grids
+    each run is seeded, so the same arguments always give the same generations
+    :param args: the parsed command line arguments
+    :return: a dictionary of "selection/encoding/grid" (or "islands/grid" or "exact/grid") names to dictionaries of
+             metrics
+    """
+    import islands
+    import main
+    import solver
+
+    results = {}
+    for selection in main.SELECTIONS:
+        for encoding in main.ENCODINGS:
+            for grid in GRIDS:
+                res = {"runs": args.runs, "solved": 0, "generations": 0, "best_fitness": 0.0, "wall_time": 0.0,
+                       "peak_memory": 0}
+                for run in range(0, args.runs):
+                    def ga():
+                        """
+                        run the genetic algorithm from the seed of this run
+                        :return: the tuple returned by run_ga
+                        """
+                        return main.run_ga(getattr(main, grid), args.population, selection, args.max_generations,
+                                           verbose=False, seed=args.seed + run, encoding=encoding)
+
+                    (fittest, gens), wall_time, peak = measure(ga, args.memory, args.repeats)
+                    res["wall_time"] += wall_time
+                    res["peak_memory"] = max(res["peak_memory"], peak or 0)
+                    res["generations"] += gens
+                    res["best_fitness"] += fittest.fitness / args.runs
+                    if fittest.fitness == 100:
+                        res["solved"] += 1
+                res["generations_per_second"] = res["generations"] / res["wall_time"] if res["wall_time"] > 0 else 0.0
+                results["%s/%s/%s" % (selection, encoding, grid)] = res
+                print(format_row("%s/%s/%s" % (selection, encoding, grid), res), file=sys.stderr)
+
+    # the island model, with the population split between the islands
+    for grid in GRIDS:
+        res = {"runs": args.runs, "solved": 0, "generations": 0, "best_fitness": 0.0, "wall_time": 0.0,
+               "peak_memory": 0}
+        for run in range(0, args.runs):
+            def island_ga():
+                """
+                run the island model from the seed of this run
+                :return: the tuple returned by run_islands
+                """
+                return islands.run_islands(getattr(main, grid), args.islands, args.population,
+                                           max_generations=args.max_generations, verbose=False, seed=args.seed + run)
+
+            # the memory of the islands is allocated in their own processes, so it is not measured
+            (fittest, gens), wall_time, peak = measure(island_ga, False, args.repeats)
+            res["wall_time"] += wall_time
+            res["generations"] += gens
+            res["best_fitness"] += fittest.fitness / args.runs
+            if fittest.fitness == 100:
+                res["solved"] += 1
+        res["generations_per_second"] = res["generations"] / res["wall_time"] if res["wall_time"] > 0 else 0.0
+        results["islands/%s" % grid] = res
+        print(format_row("islands/%s" % grid, res), file=sys.stderr)
+
+    # the exact solver, which needs no seed as it makes no random choices
+    for grid in GRIDS:
+        res = {"runs": args.runs, "solved": 0, "guesses": 0, "wall_time": 0.0, "peak_memory": 0}
+        for run in range(0, args.runs):
+            def exact():
+                """
+                solve the grid with the exact solver
+                :return: a tuple of the Solver and the solution (None if there is none)
+                """
+                grid_solver = solver.Solver(getattr(main, grid))
+                return grid_solver, grid_solver.solve()
+
+            (grid_solver, solution), wall_time, peak = measure(exact, args.memory, args.repeats)
+            res["wall_time"] += wall_time
+            res["peak_memory"] = max(res["peak_memory"], peak or 0)
+            res["guesses"] += grid_solver.guesses
+            if solution is not None:
+                res["solved"] += 1
+        results["exact/%s" % grid] = res
+        print(format_row("exact/%s" % grid, res), file=sys.stderr)
+    return results
+
+
+def format_row(name, metrics):
+    """
+    function to format the metrics of one benchmark as a line of text
+    :param name: the name of the benchmark
+    :param metrics: the dictionary of metrics
+    :return: a string
+    """
+    parts = []
+    for key, value in metrics.items():
+        if isinstance(value, float):
+            parts.append("%s=%.4g" % (key, value))
+        else:
+            parts.append("%s=%s" % (key, value))
+    return name + ": " + ", ".join(parts)
+
+
+def compare(baseline, current, tolerance, time_tolerance=None):
+    """
+    function to compare the results of a run against a saved baseline
+    the time metrics of a benchmark whose baseline took less than MIN_DURATION are printed but never reported as a
+    regression, as the timer and the scheduler make up most of so short a time
+    :param baseline: the dictionary of results loaded from the baseline file
+    :param current: the dictionary of results of this run
+    :param tolerance: the fraction a metric may get worse by before it is reported as a regression
+    :param time_tolerance: the fraction a time metric may get worse by before it is reported as a regression, which is
+                           larger as the time varies between runs of the same code, the tolerance if None
+    :return: an array of strings describing each regression
+    """
+    if time_tolerance is None:
+        time_tolerance = tolerance
+    regressions = []
+    for suite, results in current["suites"].items():
+        old_results = baseline["suites"].get(suite, {})
+        for name, metrics in results.items():
+            if name not in old_results:
+                print("NEW " + suite + " " + name)
+                continue
+            # the time metrics are only compared if the baseline ran for long enough to time reliably
+            timed = old_results[name].get("wall_time", 0) >= MIN_DURATION
+            for key, value in metrics.items():
+                old = old_results[name].get(key)
+                if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or old == value:
+                    continue
+                # the change as a fraction of the baseline, positive when the metric got worse
+                if old == 0:
+                    change = float("inf")
+                else:
+                    change = (value - old) / abs(old)
+                if key not in LOWER_IS_BETTER:
+                    change = -change
+                line = "%s %s %s: %.4g -> %.4g (%+.1f%%)" % (suite, name, key, old, value, 100 * change)
+                if key in TIME_METRICS and not timed:
+                    print(line + " (too short to compare)")
+                    continue
+                print(line)
+                if change > (time_tolerance if key in TIME_METRICS else tolerance):
+                    regressions.append(line)
+    return regressions
+
+
+def main():
+    """
+    runs the benchmark suites, each in its own process, then saves or compares the results
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the N-Puzzle searches and the Sudoku genetic algorithm")
+    parser.add_argument("--suite", choices=list(SUITES), action="append",
+                        help="suite to run, may be given more than once (default every suite)")
+    parser.add_argument("--seed", type=int, default=2423, help="seed of the corpus and the genetic algorithm")
+    parser.add_argument("--per-depth", type=int, default=5, help="8-Puzzle boards per solution length group")
+    parser.add_argument("--search", dest="searches", action="append", help="search strategy to run (default all)")
+    parser.add_argument("--heuristic", dest="heuristics", action="append", help="heuristic to run (default all)")
+    parser.add_argument("--time-limit", type=float, default=30.0, help="time budget per 8-Puzzle board, in seconds")
+    parser.add_argument("--population", type=int, default=1000, help="genetic algorithm population size")
+    parser.add_argument("--max-generations", type=int, default=50, help="genetic algorithm generation limit")
+    parser.add_argument("--runs", type=int, default=1, help="seeded genetic algorithm runs per grid")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="times each benchmark is timed, the median time is kept (default 3)")
+    parser.add_argument("--islands", type=int, default=4, help="islands of the island model genetic algorithm")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="do not measure the peak memory (halves the running time)")
+    parser.add_argument("--save", help="file to save the results to, as a baseline for later runs")
+    parser.add_argument("--compare", help="baseline file to compare the results against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="fraction a metric may get worse by before it fails the comparison (default 0.25)")
+    parser.add_argument("--time-tolerance", type=float, default=0.5,
+                        help="fraction a time metric may get worse by before it fails the comparison (default 0.5)")
+    parser.add_argument("--run-suite", choices=list(SUITES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # in the process of a single suite, run it and write its results to stdout for the parent process
+    if args.run_suite:
+        sys.path.insert(0, os.path.join(ROOT, SUITES[args.run_suite]))
+        if args.run_suite == "astar":
+            results = run_astar_suite(args)
+        else:
+            results = run_sudoku_suite(args)
+        json.dump(results, sys.stdout)
+        return
+
+    current = {"config": {key: value for key, value in vars(args).items()
+                          if key not in ("suite", "save", "compare", "tolerance", "time_tolerance", "run_suite")},
+               "python": platform.python_version(), "machine": platform.machine(), "suites": {}}
+    for suite in args.suite or list(SUITES):
+        # pass the arguments on to a new process which runs from the directory of the suite
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-suite", suite] + sys.argv[1:],
+                              cwd=os.path.join(ROOT, SUITES[suite]), stdout=subprocess.PIPE, check=True)
+        current["suites"][suite] = json.loads(proc.stdout)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print("Saved the results to " + args.save)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["config"] != current["config"]:
+            print("WARNING: the baseline was run with different arguments, the results may not be comparable")
+        regressions = compare(baseline, current, args.tolerance, args.time_tolerance)
+        if regressions:
+            print("%d REGRESSIONS above %.0f%% (%.0f%% for the times)" % (len(regressions), 100 * args.tolerance,
+                                                                        100 * args.time_tolerance))
+            sys.exit(1)
+        print("No regressions above %.0f%% (%.0f%% for the times)" % (100 * args.tolerance, 100 * args.time_tolerance))
+
+
+if __name__ == "__main__":
+    main()